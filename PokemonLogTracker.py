@@ -1,21 +1,123 @@
+import time
+
+# Taken before the remaining imports so the startup timings cover them too.
+STARTUP_T0 = time.perf_counter()
+
+import atexit
 import json
 import os
+import queue
+import sys
+import threading
 import tkinter as tk
-from tkinter import filedialog, messagebox, Toplevel, StringVar
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import filedialog, messagebox, ttk, Toplevel, StringVar
 from io import BytesIO
 import tkinter.colorchooser as colorchooser
 
-import requests
-from PIL import Image, ImageTk, ImageOps
+# requests and PIL are imported on first sprite use, numpy on first use of the
+# stats table, so none of them delay the window appearing.
+from logtracker import perf
+from logtracker.atlas import SpriteAtlas
+from logtracker.formatting import (format_coverage, format_enemy_info, format_full_info, format_log_context,
+                                   format_matchup_answers, format_seed_diff)
+from logtracker.history import open_history_store
+from logtracker.listmodel import ListModel
+from logtracker.log import PokemonLog, file_signature, load_log, log_cache_summary, reread_log
+from logtracker.names import NameIndex
+from logtracker.records import STAT_COLUMNS, record_from_dict
+from logtracker.search import SearchIndex
+from logtracker.sprites import ANIMATED_VARIANTS, SPRITE_VARIANTS, SpriteStore, dex_numbers_of
+from logtracker.workspace import Workspace, diff_logs
 
 HISTORY_FILE = "pokemon_history.json"
 SETTINGS_FILE = "settings.json"
 DEFAULT_LOG = "pokemon_data.log"
 
+SEARCH_DEBOUNCE_MS = 120
+SEARCH_RESULT_LIMIT = 20
+SELECT_COALESCE_MS = 16
+DETAIL_CACHE_KB = 1024
+
+SPRITE_CACHE_DIR = "sprite_cache"
+SPRITE_ATLAS_FILE = "sprites.atlas"
+SPRITE_CACHE_DEFAULT_MB = 32
+SPRITE_SIZE = (96, 96)
+SPRITE_WORKERS = 4
+SPRITE_POLL_MS = 15
+SPRITE_MIN_FRAME_MS = 20
+SPRITE_VARIANT_LABELS = {"front": "Front", "shiny": "Shiny", "back": "Back", "animated": "Animated"}
+STARTUP_POLL_MS = 20
+LOG_LOAD_POLL_MS = 30
+LOG_LOAD_SLICE_MS = 15
+LOG_WATCH_MS = 1000
+SPRITE_PREFETCH_WORKERS = 16
+SPRITE_PREFETCH_RETRIES = 3
+SPRITE_PREFETCH_BACKOFF = 0.3
+SPRITE_SOURCE_CACHE_MB = 16
+SPRITE_PHOTO_CACHE_MB = 8
+PERF_REFRESH_MS = 500
+
 pokemon_data = {}
 player_history = {}
 enemy_history = {}
 
+# Journal (or SQLite) backed history; see logtracker.history. The store is
+# opened on the Tk thread and only load() runs on the startup worker. Changes
+# made before load_history has merged the stored entries are held in
+# history_held ((role, key), key None for clearing the role) and written
+# afterwards, so they never race the journal replay.
+history_backend = "journal"
+history_store = None
+history_ready = False
+history_held = []
+
+# Type matchups of player_history against enemy_history
+# (logtracker.matchups.MatchupModel), built on first use and then kept in step
+# with every history change.
+matchup_model = None
+
+# Display name or key -> key for player_history, enemy_history and the log
+# (logtracker.names.NameIndex), kept in step with every change to them.
+name_index = NameIndex()
+
+# Names, types and abilities of every known species, for search-as-you-type.
+search_index = SearchIndex()
+search_after_id = None
+search_result_keys = []
+
+# The loaded log (logtracker.log.PokemonLog); pokemon_data is its stats table.
+active_log = PokemonLog()
+
+# Every log loaded this session, so switching seeds never re-parses.
+workspace = Workspace()
+
+# Log being streamed in by a worker: results go through log_load_results and
+# only messages carrying the current log_load_seq are applied.
+log_load_seq = 0
+log_load_cancel = None
+log_load_results = queue.Queue()
+log_load_polling = False
+log_load_state = None
+
+# Optional watch on the active log's file: a size/mtime check every
+# LOG_WATCH_MS, then a worker hashes and re-parses the stats table once the
+# file has stopped changing. History entries whose species changed in the log
+# are listed in stale_history (key -> what changed).
+log_watch_enabled = False
+log_watch_results = queue.Queue()
+log_watch_state = {"seen": None, "busy": False, "after": None}
+stale_history = {}
+STALE_MARK = "  (log changed)"
+
+# Milliseconds since the script started, per startup stage.
+startup_times = {}
+startup_results = queue.Queue()
+startup_timing_file = None
+if "--startup-timing" in sys.argv[1:-1]:
+    startup_timing_file = sys.argv[sys.argv.index("--startup-timing") + 1]
+
 THEMES = {
     "Light Mode": {
         "bg": "#FFFFFF",
@@ -49,13 +151,110 @@ current_theme_name = "Light Mode"
 current_theme = THEMES[current_theme_name]
 custom_theme_colors = {}
 
+# Downloaded sprites on disk (logtracker.sprites.SpriteStore).
+sprite_store = SpriteStore(SPRITE_CACHE_DIR, SPRITE_CACHE_DEFAULT_MB * 1024 * 1024,
+                           workers=SPRITE_PREFETCH_WORKERS, retries=SPRITE_PREFETCH_RETRIES,
+                           backoff=SPRITE_PREFETCH_BACKOFF)
+atexit.register(sprite_store.save_index)
+
+# Optional pre-decoded sprite pack (python -m logtracker.atlas build), looked
+# up before the store; opened by the startup job.
+sprite_atlas = None
+
+# Sprite loads run on worker threads and hand finished images back through
+# sprite_results; only the newest request (sprite_request_seq) is ever drawn.
+sprite_executor = ThreadPoolExecutor(max_workers=SPRITE_WORKERS, thread_name_prefix="sprite")
+sprite_results = queue.Queue()
+sprite_request_seq = 0
+sprite_pending = None
+sprite_polling = False
+prefetch_on_load = False
+prefetch_progress = {"done": 0, "total": 0, "fetched": 0, "failed": 0, "running": False, "cancelled": False}
+prefetch_cancel = None
+prefetch_polling = False
+
+class SizedLRU:
+    # Least-recently-used map bounded by the total byte size of its values.
+    def __init__(self, max_bytes, name="lru"):
+        self.max_bytes = max_bytes
+        self.name = name
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                perf.count(self.name, False)
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            perf.count(self.name, True)
+            return item[0]
+
+    def put(self, key, value, nbytes):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if nbytes > self.max_bytes:
+                return
+            self._items[key] = (value, nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes:
+                _, (_, size) = self._items.popitem(last=False)
+                self.bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+# Decoded RGBA sprites keyed by (dex, variant), and finished PhotoImages keyed by
+# (dex, background colour, size). The photo cache is only touched on the Tk thread.
+sprite_source_cache = SizedLRU(SPRITE_SOURCE_CACHE_MB * 1024 * 1024, "sprite.decoded")
+sprite_photo_cache = SizedLRU(SPRITE_PHOTO_CACHE_MB * 1024 * 1024, "sprite.photo")
+
+# Formatted detail text keyed by (key, full view), stored with the record it
+# was made from so a replaced entry never hits. Cleared when the log or the
+# history changes. list_select_after_id is the pending coalesced selection.
+detail_cache = SizedLRU(DETAIL_CACHE_KB * 1024, "render.text")
+list_select_after_id = None
+
+# Timing hooks (logtracker.perf) are off unless started with --perf or the
+# "perf" setting; the panel (F12) can switch them on at any time.
+perf_window = None
+if "--perf" in sys.argv[1:]:
+    perf.enable()
+sprite_current_dex = 0
+# Which sprite to show (a key of SPRITE_VARIANTS), and the animation playing
+# in the detail pane: widget, embedded image name, frames, index, after id.
+sprite_variant = "front"
+sprite_anim = {}
+
 def load_settings():
-    global current_theme_name, current_theme, custom_theme_colors
+    global current_theme_name, current_theme, custom_theme_colors, prefetch_on_load, log_watch_enabled
+    global history_backend, sprite_variant
     if not os.path.exists(SETTINGS_FILE):
         return
     try:
         with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
             data = json.load(f)
+        mb = data.get("sprite_cache_mb")
+        if isinstance(mb, (int, float)) and mb >= 0:
+            sprite_store.max_bytes = int(mb * 1024 * 1024)
+        prefetch_on_load = bool(data.get("prefetch_sprites", prefetch_on_load))
+        log_watch_enabled = bool(data.get("watch_log", log_watch_enabled))
+        if data.get("history_backend") in ("journal", "sqlite"):
+            history_backend = data["history_backend"]
+        if data.get("perf"):
+            perf.enable()
+        if data.get("sprite_variant") in SPRITE_VARIANTS:
+            sprite_variant = data["sprite_variant"]
         tn = data.get("theme", current_theme_name)
         if tn == CUSTOM_THEME_KEY:
             ct = data.get("custom_theme")
@@ -78,120 +277,372 @@ def save_settings():
             settings = {"theme": CUSTOM_THEME_KEY, "custom_theme": current_theme}
         else:
             settings = {"theme": current_theme_name}
+        settings["sprite_cache_mb"] = sprite_store.max_bytes / (1024 * 1024)
+        settings["prefetch_sprites"] = prefetch_on_load
+        settings["watch_log"] = log_watch_enabled
+        settings["history_backend"] = history_backend
+        settings["perf"] = perf.enabled
+        settings["sprite_variant"] = sprite_variant
         with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
             json.dump(settings, f, indent=2)
     except Exception:
         pass
 
-def load_history():
-    global player_history, enemy_history
-    if not os.path.exists(HISTORY_FILE):
-        player_history, enemy_history = {}, {}
-        return
+def role_source(role):
+    return {"player": player_history, "enemy": enemy_history, "log": pokemon_data}[role]
+
+def rebuild_name_index(role):
+    name_index.rebuild(role, role_source(role))
+
+def rebuild_search_index():
+    search_index.clear()
+    for d in (pokemon_data, enemy_history, player_history):
+        for k, v in d.items():
+            search_index.add_record(k, v)
+
+def display_name_of(key):
+    return (player_history.get(key) or enemy_history.get(key) or pokemon_data.get(key) or {}).get("NAME", key)
+
+def open_history():
+    global history_store
     try:
-        with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        player_history = {k: v for k, v in data.get("player_history", {}).items()}
-        enemy_history  = {k: v for k, v in data.get("enemy_history", {}).items()}
+        history_store = open_history_store(HISTORY_FILE, history_backend)
     except Exception:
-        player_history, enemy_history = {}, {}
+        history_store = None
 
+def read_history():
+    # Safe to run off the Tk thread; load_history applies the result.
+    player, enemy = history_store.load()
+    return ({k: record_from_dict(v) for k, v in player.items()},
+            {k: record_from_dict(v) for k, v in enemy.items()})
+
+def load_history(loaded=None):
+    global player_history, enemy_history, history_ready
+    try:
+        player, enemy = loaded if loaded is not None else read_history()
+    except Exception:
+        player, enemy = {}, {}
+    # Anything classified while the history was still loading is kept, and a
+    # role cleared meanwhile drops what was stored for it.
+    held = history_held[:]
+    history_held.clear()
+    cleared = {role for role, key in held if key is None}
+    player_history = {**({} if "player" in cleared else player), **player_history}
+    enemy_history  = {**({} if "enemy" in cleared else enemy), **enemy_history}
+    history_ready = True
+    for role, key in held:
+        if key is None or key in role_source(role):
+            record_history(role, key)
+    detail_cache.clear()
+    if matchup_model is not None:
+        matchup_model.reset("player", player_history)
+        matchup_model.reset("enemy", enemy_history)
+    share_history_records()
+    rebuild_name_index("player")
+    rebuild_name_index("enemy")
+    rebuild_search_index()
+
+def get_matchup_model():
+    global matchup_model
+    if matchup_model is None:
+        from logtracker.matchups import MatchupModel
+        matchup_model = MatchupModel()
+        matchup_model.reset("player", player_history)
+        matchup_model.reset("enemy", enemy_history)
+    return matchup_model
+
+def share_history_records():
+    # History entries that match the loaded log point at the log's record
+    # instead of holding a second copy.
+    for d in (player_history, enemy_history):
+        for k, v in d.items():
+            rec = pokemon_data.get(k)
+            if rec is not None and rec is not v and rec == v:
+                d[k] = rec
+
+@perf.timed("history.save")
 def save_history():
-    data = {
-        "player_history": player_history,
-        "enemy_history": enemy_history
-    }
+    # Full rewrite of the history; everyday changes go through record_history.
     try:
-        with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        history_store.compact(player_history, enemy_history)
+    except Exception:
+        pass
+
+@perf.timed("history.record")
+def record_history(role, key=None):
+    # Journal one change: the entry for key, or clearing the role if key is None.
+    if not history_ready:
+        history_held.append((role, key))
+        return
+    try:
+        if key is None:
+            history_store.clear((role,))
+        else:
+            history_store.set(role, key, role_source(role)[key])
+        history_store.maybe_compact(player_history, enemy_history)
     except Exception:
         pass
 
-def load_pokemon_data(file_path):
-    pk = {}
-    header_found = False
-    headers = []
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line:
-                continue
-            if not header_found and line.upper().startswith("NUM|NAME"):
-                headers = [h.strip().upper() for h in line.split("|")]
-                header_found = True
-                continue
-            if header_found:
-                parts = [p.strip() for p in line.split("|")]
-                if len(parts) != len(headers):
-                    continue
-                row = dict(zip(headers, parts))
-                name_key = row.get("NAME", "").strip().lower()
-                if not name_key:
-                    continue
-                for k in ["TYPE", "NUM", "HP", "ATK", "DEF", "SPE", "SATK", "SDEF"]:
-                    row.setdefault(k, "")
-                pk[name_key] = row
-    return pk
-
-def calculate_bst(data):
-    total = 0
-    for k in ["HP", "ATK", "DEF", "SPE", "SATK", "SDEF"]:
+def close_history():
+    # Fold the journal into the snapshot on the way out, but only once the
+    # stored history is in memory; before that it would overwrite it.
+    if history_store is not None:
+        if history_ready and history_store.pending:
+            save_history()
+        history_store.close()
+
+atexit.register(close_history)
+
+def set_active_log(log):
+    global active_log, pokemon_data
+    active_log = log
+    pokemon_data = log.data
+    detail_cache.clear()
+    share_history_records()
+    rebuild_name_index("log")
+    rebuild_search_index()
+
+def stat_percentiles(data):
+    return active_log.percentiles(data)
+
+@perf.timed("sprite.decode")
+def decode_sprite(blob):
+    # Every frame as (RGBA image, milliseconds); one frame for a still sprite.
+    from PIL import Image
+    img = Image.open(BytesIO(blob))
+    frames = []
+    for i in range(getattr(img, "n_frames", 1)):
+        img.seek(i)
+        frame = img.convert("RGBA")
+        frame.load()
+        frames.append((frame, max(int(img.info.get("duration") or 100), SPRITE_MIN_FRAME_MS)))
+    return frames
+
+@perf.timed("sprite.resize")
+def composite_sprite(src, bg_color, size=SPRITE_SIZE):
+    from PIL import Image
+    bg = Image.new("RGBA", src.size, bg_color)
+    img = Image.alpha_composite(bg, src)
+    return img.resize(size, Image.Resampling.LANCZOS)
+
+def composite_frames(frames, bg_color, size=SPRITE_SIZE):
+    return [(composite_sprite(img, bg_color, size), ms) for img, ms in frames]
+
+def find_sprite_atlas():
+    # Working directory first, then next to the script, then inside a
+    # PyInstaller bundle (--add-data sprites.atlas:.).
+    dirs = [os.getcwd(), os.path.dirname(os.path.abspath(sys.argv[0] or __file__))]
+    if hasattr(sys, "_MEIPASS"):
+        dirs.append(sys._MEIPASS)
+    for d in dirs:
+        path = os.path.join(d, SPRITE_ATLAS_FILE)
+        if os.path.exists(path):
+            return path
+    return None
+
+def open_sprite_atlas():
+    global sprite_atlas
+    path = find_sprite_atlas()
+    if path is None:
+        return
+    try:
+        sprite_atlas = SpriteAtlas(path)
+    except Exception:
+        sprite_atlas = None
+
+def atlas_sprite(dex_num, variant="front"):
+    # Pixels straight out of the mapped atlas, no decoding; None if absent.
+    # The atlas holds still frames only.
+    if sprite_atlas is None or variant in ANIMATED_VARIANTS:
+        return None
+    img = sprite_atlas.image(dex_num, variant)
+    perf.count("sprite.atlas", img is not None)
+    if img is None:
+        return None
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    return [(img, 0)]
+
+def _frames_bytes(frames):
+    return sum(img.width * img.height * 4 for img, _ in frames)
+
+def get_sprite_source(dex_num, variant="front"):
+    frames = sprite_source_cache.get((dex_num, variant)) or atlas_sprite(dex_num, variant)
+    if frames is None:
+        frames = decode_sprite(sprite_store.fetch(dex_num, variant))
+        sprite_source_cache.put((dex_num, variant), frames, _frames_bytes(frames))
+    return frames
+
+def _load_sprite_job(token, dex_num, variant, bg_color):
+    try:
+        if token != sprite_request_seq:
+            return
+        frames = get_sprite_source(dex_num, variant)
+        if token != sprite_request_seq:
+            return
+        sprite_results.put((token, (dex_num, variant, bg_color, SPRITE_SIZE), composite_frames(frames, bg_color), None))
+    except Exception as e:
+        sprite_results.put((token, None, None, e))
+
+def _photo_frames(frames):
+    from PIL import ImageTk
+    return [(ImageTk.PhotoImage(img), ms) for img, ms in frames]
+
+def _poll_sprite_results():
+    global sprite_polling
+    while True:
         try:
-            v = str(data.get(k, "")).strip()
-            total += int(v) if v.isdigit() or (v and v.replace("-", "").isdigit()) else 0
-        except Exception:
-            pass
-    return total
-
-def format_full_info(data):
-    lines = []
-    order = ["NUM","NAME","TYPE","HP","ATK","DEF","SPE","SATK","SDEF","ABILITY1","ABILITY2","ABILITY3","ITEM"]
-    seen = set()
-    for k in order:
-        if k in data and str(data[k]).strip() != "":
-            lines.append(f"{k}: {data[k]}")
-            seen.add(k)
-    for k, v in data.items():
-        if k not in seen and str(v).strip() != "":
-            lines.append(f"{k}: {v}")
-    lines.append(f"BST (Base Stat Total): {calculate_bst(data)}")
-    return "\n".join(lines) + "\n"
-
-def format_enemy_info(data):
-    name = str(data.get("NAME", "")).strip()
-    typ  = str(data.get("TYPE", "Unknown")).strip()
-    return f"{name}\nType: {typ}\n"
+            token, key, frames, err = sprite_results.get_nowait()
+        except queue.Empty:
+            break
+        if token != sprite_request_seq:
+            continue
+        if err is not None:
+            _place_sprite(output_text, None, err)
+            continue
+        photos = _photo_frames(frames)
+        sprite_photo_cache.put(key, photos, _frames_bytes(frames))
+        _place_sprite(output_text, photos, None)
+    if (sprite_pending is not None and not sprite_pending.done()) or not sprite_results.empty():
+        root.after(SPRITE_POLL_MS, _poll_sprite_results)
+    else:
+        sprite_polling = False
 
-def show_pokemon_image(text_widget, data):
+def _place_sprite(text_widget, frames, err):
+    stop_sprite_animation()
+    slot = text_widget.tag_ranges("sprite_slot")
+    if not slot:
+        return
+    text_widget.delete(slot[0], slot[1])
+    if err is not None:
+        text_widget.insert(slot[0], f"[Could not load image: {err}]")
+        return
+    name = text_widget.image_create(slot[0], image=frames[0][0])
+    # The widget only keeps the image it shows; this holds the frames that
+    # are on screen (never more), even if the photo cache drops them.
+    text_widget._sprite_frames = frames
+    if len(frames) > 1:
+        sprite_anim.update(widget=text_widget, name=name, frames=frames, index=0)
+        sprite_anim["after"] = root.after(frames[0][1], _next_sprite_frame)
+
+def clear_sprite(text_widget):
+    stop_sprite_animation()
+    text_widget._sprite_frames = None
+
+def stop_sprite_animation():
+    if sprite_anim.get("after") is not None:
+        root.after_cancel(sprite_anim["after"])
+    sprite_anim.clear()
+
+def _next_sprite_frame():
+    a = sprite_anim
+    a["after"] = None
+    widget = a["widget"]
+    # Nothing to draw while the window is minimised or hidden; <Map> resumes.
     try:
-        dex_str = str(data.get("NUM","")).strip()
-        dex_num = int(dex_str) if dex_str.isdigit() else 0
-        if dex_num <= 0:
-            text_widget.insert(tk.END, "\n[No dex number, cannot load image]\n")
+        if not widget.winfo_viewable():
             return
+        i = (a["index"] + 1) % len(a["frames"])
+        widget.image_configure(a["name"], image=a["frames"][i][0])
+    except tk.TclError:
+        sprite_anim.clear()
+        return
+    a["index"] = i
+    a["after"] = root.after(a["frames"][i][1], _next_sprite_frame)
+
+def resume_sprite_animation(event=None):
+    a = sprite_anim
+    if a.get("frames") and a.get("after") is None:
+        a["after"] = root.after(a["frames"][a["index"]][1], _next_sprite_frame)
+
+def cached_sprite_photo(dex_num, bg_color, size=SPRITE_SIZE, variant="front"):
+    # Tk thread only: reuse the finished frames, or re-composite from already
+    # decoded (or atlas) pixels without touching the disk or the network.
+    key = (dex_num, variant, bg_color, size)
+    photos = sprite_photo_cache.get(key)
+    if photos is None:
+        frames = sprite_source_cache.get((dex_num, variant)) or atlas_sprite(dex_num, variant)
+        if frames is None:
+            return None
+        frames = composite_frames(frames, bg_color, size)
+        photos = _photo_frames(frames)
+        sprite_photo_cache.put(key, photos, _frames_bytes(frames))
+    return photos
 
-        url = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{dex_num}.png"
-        r = requests.get(url, timeout=10)
-        r.raise_for_status()
+def show_pokemon_image(text_widget, data):
+    global sprite_request_seq, sprite_pending, sprite_polling, sprite_current_dex
+    dex_str = str(data.get("NUM","")).strip()
+    dex_num = int(dex_str) if dex_str.isdigit() else 0
+    if dex_num <= 0:
+        text_widget.insert(tk.END, "\n[No dex number, cannot load image]\n")
+        return
+    sprite_current_dex = dex_num
 
-        img = Image.open(BytesIO(r.content)).convert("RGBA")
-        bg_color = current_theme["bg"]
-        bg = Image.new("RGBA", img.size, bg_color)
-        img = Image.alpha_composite(bg, img)
+    # A newer selection supersedes whatever is still queued or in flight.
+    sprite_request_seq += 1
+    if sprite_pending is not None:
+        sprite_pending.cancel()
 
-        img = img.resize((96, 96), Image.Resampling.LANCZOS)
-        sprite = ImageTk.PhotoImage(img)
+    text_widget.tag_delete("sprite_slot")
+    text_widget.insert(tk.END, "\n")
+    text_widget.insert(tk.END, "[Loading image...]", "sprite_slot")
+    text_widget.insert(tk.END, "\n")
 
-        text_widget.insert(tk.END, "\n")
-        text_widget.image_create(tk.END, image=sprite)
-        text_widget.insert(tk.END, "\n")
+    photos = cached_sprite_photo(dex_num, current_theme["bg"], variant=sprite_variant)
+    if photos is not None:
+        _place_sprite(text_widget, photos, None)
+        return
 
-        if not hasattr(text_widget, "_images"):
-            text_widget._images = []
-        text_widget._images.append(sprite)
-    except Exception as e:
-        text_widget.insert(tk.END, f"\n[Could not load image: {e}]\n")
+    sprite_pending = sprite_executor.submit(_load_sprite_job, sprite_request_seq, dex_num, sprite_variant, current_theme["bg"])
+    if not sprite_polling:
+        sprite_polling = True
+        root.after(SPRITE_POLL_MS, _poll_sprite_results)
+
+def cancel_sprite_prefetch():
+    global prefetch_cancel
+    if prefetch_cancel is not None:
+        prefetch_cancel.set()
+        prefetch_cancel = None
+        if prefetch_progress["running"]:
+            prefetch_progress.update(running=False, cancelled=True)
+
+def start_sprite_prefetch():
+    # Warms the cache with the variant currently shown.
+    global prefetch_cancel, prefetch_polling
+    cancel_sprite_prefetch()
+    cancel = threading.Event()
+    prefetch_cancel = cancel
+    dex_numbers = dex_numbers_of(pokemon_data)
+    variant = sprite_variant
+
+    def progress(stats):
+        if not cancel.is_set():
+            prefetch_progress.update(stats)
+
+    def run():
+        stats = sprite_store.prefetch(dex_numbers, variant, progress=progress, cancel=cancel)
+        if not cancel.is_set():
+            prefetch_progress.update(stats, running=False)
+
+    prefetch_progress.update(done=0, total=0, fetched=0, failed=0, running=True, cancelled=False)
+    threading.Thread(target=run, name="prefetch", daemon=True).start()
+    if not prefetch_polling:
+        prefetch_polling = True
+        root.after(100, _poll_prefetch_progress)
+
+def _poll_prefetch_progress():
+    global prefetch_polling
+    p = prefetch_progress
+    if p["running"]:
+        status_var.set(f"Prefetching sprites: {p['done']}/{p['total']}")
+        root.after(100, _poll_prefetch_progress)
+        return
+    prefetch_polling = False
+    if not p["cancelled"]:
+        msg = f"Sprites ready: {p['fetched']} downloaded"
+        if p["failed"]:
+            msg += f", {p['failed']} failed"
+        status_var.set(msg + ".")
 
 def ask_classification(display_name):
     result = {"choice": None}
@@ -223,36 +674,137 @@ SECTION_PLAYER = "--- Player History ---"
 SECTION_ENEMY  = "--- Enemy History ---"
 SECTION_LOG    = "--- From Log ---"
 
+LIST_SECTIONS = (("player", SECTION_PLAYER), ("enemy", SECTION_ENEMY), ("log", SECTION_LOG))
+SECTION_TITLES = dict(LIST_SECTIONS)
+
+# Sorted mirror of the listbox rows (logtracker.listmodel.ListModel); every
+# insert or delete on it is repeated on the listbox at the same position.
+list_model = ListModel([role for role, _ in LIST_SECTIONS], pinned=("log",))
+
+def _list_row_text(row):
+    role = list_model.role_of(row)
+    if not row[2]:
+        return SECTION_TITLES[role]
+    text = str(role_source(role)[row[2]].get("NAME", row[2])).strip()
+    if role != "log" and row[2] in stale_history:
+        text += STALE_MARK
+    return text
+
+def _list_view_state():
+    top = pokemon_listbox.nearest(0)
+    sel = pokemon_listbox.curselection()
+    top_row = list_model[top] if 0 <= top < len(list_model) else None
+    sel_row = list_model[sel[0]] if sel and sel[0] < len(list_model) else None
+    return top_row, sel_row
+
+def _restore_list_view(state):
+    top_row, sel_row = state
+    if top_row is not None:
+        pokemon_listbox.yview(min(list_model.position(top_row), max(len(list_model) - 1, 0)))
+    pokemon_listbox.selection_clear(0, tk.END)
+    if sel_row is not None:
+        i = list_model.index(sel_row)
+        if i is not None:
+            pokemon_listbox.selection_set(i)
+            pokemon_listbox.activate(i)
+
+def _list_insert(row):
+    i = list_model.insert(row)
+    if i is not None:
+        pokemon_listbox.insert(i, _list_row_text(row))
+
+def _list_delete(row):
+    i = list_model.delete(row)
+    if i is not None:
+        pokemon_listbox.delete(i)
+
+def _list_refresh(row):
+    i = list_model.index(row)
+    if i is not None:
+        pokemon_listbox.delete(i)
+        pokemon_listbox.insert(i, _list_row_text(row))
+
+@perf.timed("list.add")
+def list_add(role, key, data):
+    # One targeted insert (plus the section header the first time) instead of
+    # rebuilding every row; the view and selection stay where they were.
+    state = _list_view_state()
+    _list_insert(list_model.header(role))
+    _list_insert(list_model.row(role, key, data))
+    _restore_list_view(state)
+
+@perf.timed("list.add_batch")
+def list_add_many(role, items):
+    state = _list_view_state()
+    _list_insert(list_model.header(role))
+    for key, data in items:
+        _list_insert(list_model.row(role, key, data))
+    _restore_list_view(state)
+
+@perf.timed("list.rebuild")
 def populate_listbox():
+    state = _list_view_state()
+    rows = list_model.rebuild({role: role_source(role) for role, _ in LIST_SECTIONS})
     pokemon_listbox.delete(0, tk.END)
-    if player_history:
-        pokemon_listbox.insert(tk.END, SECTION_PLAYER)
-        for name_key in sorted(player_history.keys(), key=lambda n: player_history[n].get("NAME","").lower()):
-            pokemon_listbox.insert(tk.END, player_history[name_key].get("NAME", name_key).strip())
-    if enemy_history:
-        pokemon_listbox.insert(tk.END, SECTION_ENEMY)
-        for name_key in sorted(enemy_history.keys(), key=lambda n: enemy_history[n].get("NAME","").lower()):
-            pokemon_listbox.insert(tk.END, enemy_history[name_key].get("NAME", name_key).strip())
-    pokemon_listbox.insert(tk.END, SECTION_LOG)
-    for name_key in sorted(pokemon_data.keys(), key=lambda n: pokemon_data[n].get("NAME","").lower()):
-        pokemon_listbox.insert(tk.END, pokemon_data[name_key].get("NAME", name_key).strip())
+    if rows:
+        pokemon_listbox.insert(tk.END, *[_list_row_text(r) for r in rows])
+    _restore_list_view(state)
 
 def key_from_display(display_name):
-    dn = display_name.strip().lower()
-    for d in (player_history, enemy_history):
-        for k, v in d.items():
-            if v.get("NAME","").strip().lower() == dn or k == dn:
-                return k, d
-    for k, v in pokemon_data.items():
-        if v.get("NAME","").strip().lower() == dn or k == dn:
-            return k, pokemon_data
-    return None, None
+    role, key = name_index.lookup(display_name)
+    if key is None:
+        return None, None
+    return key, role_source(role)
+
+def classify(key, data, choice):
+    role = "player" if choice == "yours" else "enemy"
+    entry = data.copy()
+    role_source(role)[key] = entry
+    stale_history.pop(key, None)
+    if matchup_model is not None:
+        matchup_model.set(role, key, entry)
+    name_index.add(role, key, entry)
+    if key not in search_index:
+        search_index.add_record(key, entry)
+    record_history(role, key)
+    list_add(role, key, entry)
+    show_details(key, data, full=role == "player")
+
+def detail_text(key, data, full):
+    cached = detail_cache.get((key, full))
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    text = format_full_info(data, stat_percentiles(data)) if full else format_enemy_info(data)
+    text += format_log_context(active_log, key, full)
+    detail_cache.put((key, full), (data, text), len(text))
+    return text
+
+@perf.timed("render.details")
+def show_details(key, data, full):
+    if key in stale_history and data is not pokemon_data.get(key):
+        output_text.insert(tk.END, f"[The log file changed since this was recorded: {stale_history[key]}]\n\n")
+    output_text.insert(tk.END, detail_text(key, data, full))
+    if not full and player_history:
+        output_text.insert(tk.END, format_matchup_answers(get_matchup_model().answers(data)))
+    show_pokemon_image(output_text, data)
+
+def schedule_list_select(event=None):
+    # Holding an arrow key fires <<ListboxSelect>> for every row; render at
+    # most once per frame, for whatever is selected by then.
+    global list_select_after_id
+    if list_select_after_id is None:
+        list_select_after_id = root.after(SELECT_COALESCE_MS, _run_list_select)
+
+def _run_list_select():
+    global list_select_after_id
+    list_select_after_id = None
+    on_list_select()
 
 def on_list_select(event=None):
     sel = pokemon_listbox.curselection()
     if not sel:
         return
-    display = pokemon_listbox.get(sel[0])
+    display = pokemon_listbox.get(sel[0]).removesuffix(STALE_MARK)
     if display in (SECTION_PLAYER, SECTION_ENEMY, SECTION_LOG):
         return
 
@@ -261,88 +813,102 @@ def on_list_select(event=None):
         return
 
     output_text.delete("1.0", tk.END)
-    output_text._images = []
+    clear_sprite(output_text)
 
     if source is player_history:
         data = player_history[key]
-        output_text.insert(tk.END, format_full_info(data))
-        show_pokemon_image(output_text, data)
+        show_details(key, data, full=True)
         return
     if source is enemy_history:
         data = enemy_history[key]
-        output_text.insert(tk.END, format_enemy_info(data))
-        show_pokemon_image(output_text, data)
+        show_details(key, data, full=False)
         return
 
     data = pokemon_data[key]
     if key in player_history:
-        output_text.insert(tk.END, format_full_info(player_history[key]))
-        show_pokemon_image(output_text, player_history[key])
+        show_details(key, player_history[key], full=True)
     elif key in enemy_history:
-        output_text.insert(tk.END, format_enemy_info(enemy_history[key]))
-        show_pokemon_image(output_text, enemy_history[key])
+        show_details(key, enemy_history[key], full=False)
     else:
         display_name = data.get("NAME", key.title()).strip()
         choice = ask_classification(display_name)
         if not choice:
             output_text.insert(tk.END, "[Cancelled]\n")
             return
-        if choice == "yours":
-            player_history[key] = data.copy()
-            save_history()
-            populate_listbox()
-            output_text.insert(tk.END, format_full_info(data))
-            show_pokemon_image(output_text, data)
-        else:
-            enemy_history[key] = data.copy()
-            save_history()
-            populate_listbox()
-            output_text.insert(tk.END, format_enemy_info(data))
-            show_pokemon_image(output_text, data)
+        classify(key, data, choice)
+
+def show_search_results(keys):
+    search_result_keys[:] = keys
+    search_results.delete(0, tk.END)
+    if not keys:
+        search_results.pack_forget()
+        return
+    search_results.insert(tk.END, *[str(display_name_of(k)).strip() for k in keys])
+    if not search_results.winfo_ismapped():
+        search_results.pack(fill=tk.X, padx=8, before=main_frame)
+
+@perf.timed("search")
+def run_incremental_search():
+    global search_after_id
+    search_after_id = None
+    query = search_entry.get()
+    keys = [k for k, _ in search_index.query(query, SEARCH_RESULT_LIMIT)] if query.strip() else []
+    show_search_results(keys)
+
+def on_search_key(event=None):
+    global search_after_id
+    if event is not None and event.keysym in ("Return", "KP_Enter", "Up", "Down", "Escape"):
+        return
+    if search_after_id is not None:
+        root.after_cancel(search_after_id)
+    search_after_id = root.after(SEARCH_DEBOUNCE_MS, run_incremental_search)
+
+def on_search_down(event=None):
+    if search_result_keys:
+        search_results.focus_set()
+        search_results.selection_clear(0, tk.END)
+        search_results.selection_set(0)
+        search_results.activate(0)
+    return "break"
+
+def on_search_result_pick(event=None):
+    sel = search_results.curselection()
+    if not sel:
+        return
+    key = search_result_keys[sel[0]]
+    search_entry.delete(0, tk.END)
+    search_entry.insert(0, str(display_name_of(key)).strip())
+    search_entry.focus_set()
+    search_pokemon()
+
+def hide_search_results(event=None):
+    show_search_results([])
+    search_entry.focus_set()
 
 def search_pokemon(event=None):
+    global search_after_id
+    if search_after_id is not None:
+        root.after_cancel(search_after_id)
+        search_after_id = None
     query = search_entry.get().strip().lower()
     output_text.delete("1.0", tk.END)
-    output_text._images = []
+    clear_sprite(output_text)
 
     if not query:
+        show_search_results([])
         output_text.insert(tk.END, "Type a Pokémon name to search.\n")
         return
 
-    def find_exact(q):
-        if q in player_history: return ("player", q)
-        if q in enemy_history:  return ("enemy", q)
-        if q in pokemon_data:   return ("log", q)
-        for role, d in (("player", player_history), ("enemy", enemy_history), ("log", pokemon_data)):
-            for k, v in d.items():
-                if v.get("NAME","").strip().lower() == q:
-                    return (role, k)
-        return (None, None)
-
-    role, key = find_exact(query)
+    role, key = name_index.lookup(query)
     if not key:
-        def collect_matches(q, d):
-            out = []
-            for k, v in d.items():
-                nm = v.get("NAME","").strip().lower()
-                if q in nm or q in k:
-                    out.append(k)
-            return out
-
-        matches = (
-            collect_matches(query, player_history) +
-            collect_matches(query, enemy_history) +
-            collect_matches(query, pokemon_data)
-        )
-        matches = list(dict.fromkeys(matches))
+        matches = [k for k, _ in search_index.query(query, SEARCH_RESULT_LIMIT)]
         if not matches:
+            show_search_results([])
             output_text.insert(tk.END, "No matches found.\n")
             return
         if len(matches) > 1:
-            output_text.insert(tk.END, "Multiple matches found:\n")
-            for k in matches:
-                nm = (player_history.get(k) or enemy_history.get(k) or pokemon_data.get(k) or {}).get("NAME", k)
-                output_text.insert(tk.END, f"- {nm}\n")
+            show_search_results(matches)
+            output_text.insert(tk.END, "Multiple matches found, pick one from the list above.\n")
             return
         key = matches[0]
         if key in player_history:
@@ -352,68 +918,498 @@ def search_pokemon(event=None):
         else:
             role = "log"
 
+    show_search_results([])
     if role == "player":
         data = player_history[key]
-        output_text.insert(tk.END, format_full_info(data))
-        show_pokemon_image(output_text, data)
+        show_details(key, data, full=True)
     elif role == "enemy":
         data = enemy_history[key]
-        output_text.insert(tk.END, format_enemy_info(data))
-        show_pokemon_image(output_text, data)
+        show_details(key, data, full=False)
     else:
         data = pokemon_data.get(key)
         if not data:
             output_text.insert(tk.END, "Not found in current log.\n")
             return
         if key in player_history:
-            output_text.insert(tk.END, format_full_info(player_history[key]))
-            show_pokemon_image(output_text, player_history[key])
+            show_details(key, player_history[key], full=True)
         elif key in enemy_history:
-            output_text.insert(tk.END, format_enemy_info(enemy_history[key]))
-            show_pokemon_image(output_text, enemy_history[key])
+            show_details(key, enemy_history[key], full=False)
         else:
             display_name = data.get("NAME", key.title()).strip()
             choice = ask_classification(display_name)
             if not choice:
                 output_text.insert(tk.END, "[Cancelled]\n")
                 return
-            if choice == "yours":
-                player_history[key] = data.copy()
-                save_history()
-                populate_listbox()
-                output_text.insert(tk.END, format_full_info(data))
-                show_pokemon_image(output_text, data)
+            classify(key, data, choice)
+
+def mark_startup(stage):
+    startup_times[stage] = (time.perf_counter() - STARTUP_T0) * 1000
+
+def report_startup():
+    # --startup-timing FILE: append one JSON line and quit, for scripted
+    # measurements of the built app.
+    if not startup_timing_file:
+        return
+    try:
+        with open(startup_timing_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(startup_times) + "\n")
+    except Exception:
+        pass
+    root.after_idle(root.destroy)
+
+def startup_summary():
+    t = startup_times
+    s = f"first paint {t.get('first_paint', 0):.0f} ms, interactive {t.get('interactive', 0):.0f} ms"
+    if "log_loaded" in t:
+        s += f", log loaded {t['log_loaded']:.0f} ms"
+    return s
+
+def _startup_job():
+    result = {}
+    sprite_store.load_index()
+    open_sprite_atlas()
+    try:
+        result["history"] = read_history()
+    except Exception:
+        result["history"] = ({}, {})
+    startup_results.put(result)
+
+def _poll_startup():
+    try:
+        result = startup_results.get_nowait()
+    except queue.Empty:
+        root.after(STARTUP_POLL_MS, _poll_startup)
+        return
+    load_history(result["history"])
+    populate_listbox()
+    mark_startup("interactive")
+    # A log the user opened in the meantime wins over the default one.
+    if os.path.exists(DEFAULT_LOG) and active_log.path is None and log_load_state is None:
+        def done(ok):
+            mark_startup("log_loaded")
+            if ok:
+                status_var.set(status_var.get() + f"; {startup_summary()}")
+            report_startup()
+        start_log_load(DEFAULT_LOG, on_done=done)
+    else:
+        status_var.set(f"Ready; {startup_summary()}")
+        report_startup()
+
+def cancel_log_load():
+    global log_load_seq
+    if log_load_state is None:
+        return
+    log_load_cancel.set()
+    log_load_seq += 1
+    _end_log_load(False)
+
+def start_log_load(path, on_done=None):
+    # Parses the log on a worker thread; rows are added to the list in
+    # batches as they arrive. Starting another load cancels this one.
+    global log_load_seq, log_load_cancel, log_load_state, log_load_polling
+    cancel_log_load()
+    cancel_sprite_prefetch()
+    log_load_seq += 1
+    token = log_load_seq
+    cancel = threading.Event()
+    log_load_cancel = cancel
+    log_load_state = {"path": path, "started": False, "on_done": on_done}
+
+    def on_rows(rows, done, total):
+        log_load_results.put((token, "rows", rows, done, total))
+
+    def run():
+        try:
+            log = load_log(path, on_rows=on_rows, cancel=cancel)
+            if log is not None:
+                log_load_results.put((token, "done", log, 0, 0))
+        except Exception as e:
+            log_load_results.put((token, "error", e, 0, 0))
+
+    load_progress["value"] = 0
+    load_progress.pack(side=tk.BOTTOM, fill=tk.X, padx=8, before=main_frame)
+    status_var.set(f"Loading {os.path.basename(path)}…")
+    threading.Thread(target=run, name="log-load", daemon=True).start()
+    if not log_load_polling:
+        log_load_polling = True
+        root.after(LOG_LOAD_POLL_MS, _poll_log_load)
+
+def _poll_log_load():
+    # Applies queued batches for at most LOG_LOAD_SLICE_MS per tick so the
+    # window keeps handling input while a large log streams in.
+    global log_load_polling
+    deadline = time.perf_counter() + LOG_LOAD_SLICE_MS / 1000
+    while time.perf_counter() < deadline:
+        try:
+            token, kind, payload, done, total = log_load_results.get_nowait()
+        except queue.Empty:
+            break
+        if token != log_load_seq or log_load_state is None:
+            continue
+        if kind == "rows":
+            _apply_log_rows(payload, done, total)
+        elif kind == "done":
+            _finish_log_load(payload)
+        else:
+            _fail_log_load(payload)
+    if log_load_state is not None or not log_load_results.empty():
+        root.after(LOG_LOAD_POLL_MS, _poll_log_load)
+    else:
+        log_load_polling = False
+
+def _start_streamed_log():
+    # The previous log stays on screen until the new one has its first rows.
+    log_load_state["started"] = True
+    set_active_log(PokemonLog(log_load_state["path"]))
+    populate_listbox()
+
+@perf.timed("log.apply_batch")
+def _apply_log_rows(rows, done, total):
+    if not log_load_state["started"]:
+        _start_streamed_log()
+    active_log.extend(rows)
+    detail_cache.clear()
+    for k, v in rows:
+        name_index.add("log", k, v)
+        if k not in player_history and k not in enemy_history:
+            search_index.add_record(k, v)
+    if rows:
+        list_add_many("log", rows)
+    if total:
+        load_progress["value"] = done * 100 / total
+    status_var.set(f"Loading {os.path.basename(log_load_state['path'])}: {len(pokemon_data)} Pokémon…")
+
+def _end_log_load(ok):
+    global log_load_state, log_load_cancel
+    on_done = log_load_state["on_done"]
+    log_load_state = None
+    log_load_cancel = None
+    load_progress.pack_forget()
+    if on_done is not None:
+        on_done(ok)
+
+def _finish_log_load(log):
+    if not log_load_state["started"]:
+        _start_streamed_log()
+    active_log.set_sections(log.sections, log.signature)
+    detail_cache.clear()
+    workspace.add(active_log)
+    share_history_records()
+    refresh_seed_menu()
+    status_var.set(f"Loaded {len(pokemon_data)} Pokémon from {os.path.basename(log.path)} in {log_cache_summary()}")
+    _end_log_load(True)
+    if prefetch_on_load and pokemon_data:
+        start_sprite_prefetch()
+
+def _fail_log_load(err):
+    status_var.set(f"Could not load {os.path.basename(log_load_state['path'])}: {err}")
+    _end_log_load(False)
+    messagebox.showerror("Error", f"Failed to load file:\n{err}")
+
+def refresh_seed_menu():
+    menu = seed_menu["menu"]
+    menu.delete(0, tk.END)
+    for path in workspace.logs:
+        menu.add_command(label=workspace.label(path), command=lambda p=path: switch_seed(p))
+    seed_var.set(workspace.label(active_log.path) if active_log.path in workspace else "No log")
+
+def switch_seed(path):
+    log = workspace.get(path)
+    if log is None or log is active_log:
+        return
+    cancel_log_load()
+    set_active_log(log)
+    populate_listbox()
+    refresh_seed_menu()
+    status_var.set(f"Switched to {workspace.label(path)} ({len(pokemon_data)} Pokémon)")
+    # A selected history entry is redrawn against the new seed; log rows are
+    # left alone so switching never pops up the classification dialog.
+    sel = pokemon_listbox.curselection()
+    if sel and list_model.role_of(list_model[sel[0]]) != "log":
+        on_list_select()
+
+def start_log_watch():
+    if log_watch_enabled and log_watch_state["after"] is None:
+        log_watch_state["after"] = root.after(LOG_WATCH_MS, _poll_log_watch)
+
+def on_watch_toggle():
+    global log_watch_enabled
+    log_watch_enabled = watch_var.get()
+    save_settings()
+    start_log_watch()
+
+def _poll_log_watch():
+    st = log_watch_state
+    st["after"] = None
+    if not log_watch_enabled:
+        return
+    try:
+        result = log_watch_results.get_nowait()
+    except queue.Empty:
+        result = None
+    if result is not None:
+        st["busy"] = False
+        _apply_log_reread(*result)
+    log = active_log
+    if not st["busy"] and log_load_state is None and log.path and log.signature is not None:
+        try:
+            sig = file_signature(log.path)
+        except OSError:
+            sig = None
+        # Re-read only once size and mtime have held still for a whole
+        # interval, so a file that is still being written is never parsed.
+        if sig is not None and sig != log.signature[:2] and sig == st["seen"] and sig != st.get("failed"):
+            st["busy"] = True
+            threading.Thread(target=_log_reread_job, args=(log, sig), name="log-watch", daemon=True).start()
+        st["seen"] = sig
+    st["after"] = root.after(LOG_WATCH_MS, _poll_log_watch)
+
+def _log_reread_job(log, sig):
+    try:
+        signature, parsed = reread_log(log)
+        log_watch_results.put((log, sig, signature, parsed, None))
+    except Exception as e:
+        log_watch_results.put((log, sig, None, None, e))
+
+def _stat_change_notes(keys):
+    # key -> "TYPE A → B, HP x → y" for history entries whose type or base
+    # stats differ from the species now in the log.
+    hist = {k: player_history.get(k) or enemy_history.get(k) for k in keys}
+    diff = diff_logs(hist, {k: pokemon_data[k] for k in keys})
+    notes = {}
+    for k, _, old, new in diff["types"]:
+        notes.setdefault(k, []).append(f"TYPE {old} → {new}")
+    for k, _, changed, _, _ in diff["stats"]:
+        notes.setdefault(k, []).extend(f"{s} {x} → {y}" for s, x, y in changed)
+    return {k: ", ".join(v) for k, v in notes.items()}
+
+@perf.timed("log.reload")
+def _apply_log_reread(log, sig, signature, parsed, err):
+    if log is not active_log or log_load_state is not None:
+        return
+    if err is not None:
+        log_watch_state["failed"] = sig
+        status_var.set(f"Could not re-read {os.path.basename(log.path)}: {err}")
+        return
+    if parsed is None:
+        log.signature = signature
+        return
+    # Only the species that changed touch the list and the indexes.
+    in_workspace = log.path in workspace
+    if in_workspace:
+        workspace.remove(log.path)
+    changes = log.apply_update(*parsed, signature)
+    name_index.update("log", changes)
+    if in_workspace:
+        workspace.add(log)
+    detail_cache.clear()
+    state = _list_view_state()
+    for k, rec in changes["removed"].items():
+        _list_delete(list_model.row("log", k, rec))
+        if k not in player_history and k not in enemy_history:
+            search_index.remove(k)
+    for k, (old, new) in changes["changed"].items():
+        if list_model.row("log", k, old) != list_model.row("log", k, new):
+            _list_delete(list_model.row("log", k, old))
+            _list_insert(list_model.row("log", k, new))
+        if k not in player_history and k not in enemy_history:
+            search_index.add_record(k, new)
+    for k, rec in changes["added"].items():
+        _list_insert(list_model.row("log", k, rec))
+        if k not in player_history and k not in enemy_history:
+            search_index.add_record(k, rec)
+
+    touched = set(changes["changed"]) | set(changes["added"])
+    in_history = [k for k in touched if k in player_history or k in enemy_history]
+    notes = _stat_change_notes(in_history)
+    for k in in_history:
+        if notes.get(k) != stale_history.get(k):
+            if k in notes:
+                stale_history[k] = notes[k]
             else:
-                enemy_history[key] = data.copy()
-                save_history()
-                populate_listbox()
-                output_text.insert(tk.END, format_enemy_info(data))
-                show_pokemon_image(output_text, data)
+                stale_history.pop(k, None)
+            role = "player" if k in player_history else "enemy"
+            _list_refresh(list_model.row(role, k, role_source(role)[k]))
+    _restore_list_view(state)
+
+    status_var.set(f"Reloaded {os.path.basename(log.path)}: {len(changes['changed'])} changed, "
+                   f"{len(changes['added'])} added, {len(changes['removed'])} removed"
+                   + (f", {len(notes)} history entries flagged" if notes else ""))
+    sel = pokemon_listbox.curselection()
+    if sel and list_model[sel[0]][2] in touched and list_model.role_of(list_model[sel[0]]) != "log":
+        on_list_select()
 
 def open_file():
-    global pokemon_data
     path = filedialog.askopenfilename(
         title="Select Pokémon Data File",
         filetypes=[("Log/Text files", "*.log *.txt"), ("All files", "*.*")]
     )
     if not path:
         return
-    try:
-        pokemon_data = load_pokemon_data(path)
-        messagebox.showinfo("Loaded", f"Loaded {len(pokemon_data)} Pokémon.")
-        populate_listbox()
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to load file:\n{e}")
+    start_log_load(path)
+
+def open_stats_window():
+    t = current_theme
+    win = Toplevel(root)
+    win.title("Log Stats")
+    win.geometry("460x460")
+    win.configure(bg=t["bg"])
+
+    stat_var = StringVar(value="BST")
+    type_var = StringVar(value="All types")
+    lowest_var = tk.BooleanVar(value=False)
+
+    row = tk.Frame(win, bg=t["bg"])
+    row.pack(fill=tk.X, padx=8, pady=6)
+    table = active_log.stat_table()
+    tk.OptionMenu(row, stat_var, *STAT_COLUMNS, command=lambda _: refresh()).pack(side=tk.LEFT)
+    tk.OptionMenu(row, type_var, "All types", *table.type_names, command=lambda _: refresh()).pack(side=tk.LEFT, padx=6)
+    tk.Checkbutton(row, text="Lowest first", variable=lowest_var, command=lambda: refresh(),
+                   bg=t["bg"], fg=t["fg"], selectcolor=t["entry_bg"]).pack(side=tk.LEFT)
+
+    ranking = tk.Listbox(win, height=20, font=("Courier", 10))
+    ranking.pack(fill=tk.BOTH, expand=True, padx=8)
+    summary = tk.Label(win, justify=tk.LEFT, anchor="w", wraplength=440)
+    summary.pack(fill=tk.X, padx=8, pady=6)
+
+    def refresh():
+        table = active_log.stat_table()
+        type_name = None if type_var.get() == "All types" else type_var.get()
+        ranking.delete(0, tk.END)
+        rows = table.top(stat_var.get(), 20, type_name, lowest_var.get())
+        ranking.insert(tk.END, *[f"{i:>3}. {name:<14} {value:>4}" for i, (_, name, value) in enumerate(rows, 1)])
+        counts = ", ".join(f"{name.title()} {n}" for name, n in table.type_counts())
+        summary.configure(text=f"{len(table)} Pokémon. Types: {counts}")
+
+    for widget in win.winfo_children():
+        apply_theme_rec(widget, t)
+    refresh()
+
+@perf.timed("matchups.coverage")
+def matchup_summary():
+    return format_coverage(get_matchup_model().coverage())
+
+def open_matchup_window():
+    t = current_theme
+    win = Toplevel(root)
+    win.title("Matchups")
+    win.geometry("520x420")
+    win.configure(bg=t["bg"])
+
+    out = tk.Text(win, wrap=tk.WORD, font=("Courier", 10))
+    out.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+    out.insert(tk.END, matchup_summary())
+
+    for widget in win.winfo_children():
+        apply_theme_rec(widget, t)
+
+def open_diff_window():
+    if len(workspace) < 2:
+        messagebox.showinfo("Compare Seeds", "Load at least two logs to compare them.")
+        return
+    t = current_theme
+    win = Toplevel(root)
+    win.title("Compare Seeds")
+    win.geometry("620x520")
+    win.configure(bg=t["bg"])
+
+    labels = {workspace.label(p): p for p in workspace.logs}
+    names = list(labels)
+    current = workspace.label(active_log.path) if active_log.path in workspace else names[-1]
+    a_var = StringVar(value=names[0] if names[0] != current else names[1])
+    b_var = StringVar(value=current)
+
+    row = tk.Frame(win, bg=t["bg"])
+    row.pack(fill=tk.X, padx=8, pady=6)
+    tk.OptionMenu(row, a_var, *names, command=lambda _: refresh()).pack(side=tk.LEFT)
+    tk.Label(row, text="→").pack(side=tk.LEFT, padx=6)
+    tk.OptionMenu(row, b_var, *names, command=lambda _: refresh()).pack(side=tk.LEFT)
+
+    out = tk.Text(win, wrap=tk.WORD)
+    out.pack(fill=tk.BOTH, expand=True, padx=8, pady=(0, 8))
+
+    def refresh():
+        pa, pb = labels[a_var.get()], labels[b_var.get()]
+        diff = workspace.diff(pa, pb)
+        out.delete("1.0", tk.END)
+        out.insert(tk.END, format_seed_diff(diff, a_var.get(), b_var.get(),
+                                            workspace.get(pa).data, workspace.get(pb).data))
+
+    for widget in win.winfo_children():
+        apply_theme_rec(widget, t)
+    refresh()
+
+def toggle_perf_panel(event=None):
+    # F12: live p50/p95 per operation and cache hit ratios, with a Chrome
+    # trace export for attaching to bug reports.
+    global perf_window
+    if perf_window is not None and perf_window.winfo_exists():
+        perf_window.destroy()
+        perf_window = None
+        return
+    t = current_theme
+    win = perf_window = Toplevel(root)
+    win.title("Performance")
+    win.geometry("560x420")
+    win.configure(bg=t["bg"])
+
+    enabled_var = tk.BooleanVar(value=perf.enabled)
+
+    def set_enabled():
+        perf.enable(enabled_var.get())
+        save_settings()
+
+    def export():
+        path = filedialog.asksaveasfilename(parent=win, title="Export Chrome Trace", defaultextension=".json",
+                                            initialfile="logtracker-trace.json",
+                                            filetypes=[("Trace JSON", "*.json"), ("All files", "*.*")])
+        if path:
+            try:
+                perf.export_chrome_trace(path)
+                status_var.set(f"Trace written to {path}")
+            except Exception as e:
+                messagebox.showerror("Export failed", str(e), parent=win)
+
+    row = tk.Frame(win, bg=t["bg"])
+    row.pack(fill=tk.X, padx=8, pady=6)
+    tk.Checkbutton(row, text="Record timings", variable=enabled_var, command=set_enabled,
+                   bg=t["bg"], fg=t["fg"], selectcolor=t["entry_bg"]).pack(side=tk.LEFT)
+    tk.Button(row, text="Reset", command=perf.reset).pack(side=tk.LEFT, padx=6)
+    tk.Button(row, text="Export Trace…", command=export).pack(side=tk.LEFT)
+
+    out = tk.Text(win, font=("Courier", 10), wrap=tk.NONE)
+    out.pack(fill=tk.BOTH, expand=True, padx=8, pady=(0, 8))
+
+    def refresh():
+        if perf_window is not win or not win.winfo_exists():
+            return
+        text = perf.format_summary() if perf.enabled or perf.summary() else "Timing is off. Tick “Record timings”.\n"
+        out.delete("1.0", tk.END)
+        out.insert(tk.END, text)
+        win.after(PERF_REFRESH_MS, refresh)
+
+    for widget in win.winfo_children():
+        apply_theme_rec(widget, t)
+    refresh()
 
 def clear_history():
     if messagebox.askyesno("Clear History", "Clear Player and Enemy history? This cannot be undone."):
         player_history.clear()
         enemy_history.clear()
-        save_history()
+        stale_history.clear()
+        detail_cache.clear()
+        if matchup_model is not None:
+            matchup_model.reset("player", player_history)
+            matchup_model.reset("enemy", enemy_history)
+        rebuild_name_index("player")
+        rebuild_name_index("enemy")
+        rebuild_search_index()
+        record_history("player")
+        record_history("enemy")
         populate_listbox()
         output_text.delete("1.0", tk.END)
         output_text.insert(tk.END, "History cleared.\n")
-        output_text._images = []
+        clear_sprite(output_text)
 
 def apply_theme():
     t = current_theme
@@ -435,6 +1431,9 @@ def apply_theme_rec(widget, theme):
         widget.configure(bg=theme["listbox_bg"], fg=theme["listbox_fg"], selectbackground=theme["button_bg"], selectforeground=theme["button_fg"])
     elif cls == "Text":
         widget.configure(bg=theme["text_bg"], fg=theme["text_fg"], insertbackground=theme["fg"])
+    elif cls == "Checkbutton":
+        widget.configure(bg=theme["bg"], fg=theme["fg"], activebackground=theme["bg"],
+                         activeforeground=theme["fg"], selectcolor=theme["entry_bg"])
     elif cls == "OptionMenu":
         widget.configure(bg=theme["button_bg"], fg=theme["button_fg"])
         # Also set menu colors:
@@ -451,6 +1450,17 @@ def open_custom_theme_editor():
         if color:
             custom_theme_colors[setting_key] = color
             btn.config(bg=color)
+            if setting_key == "bg":
+                update_preview()
+
+    def update_preview():
+        bg = custom_theme_colors.get("bg", current_theme.get("bg", "#FFFFFF"))
+        preview.configure(bg=bg)
+        photos = cached_sprite_photo(sprite_current_dex, bg, variant=sprite_variant) if sprite_current_dex else None
+        if photos is not None:
+            sprite = photos[0][0]
+            preview.configure(image=sprite)
+            preview.image = sprite
 
     def save_custom_theme():
         global current_theme, current_theme_name  # Declare globals at top of this inner function
@@ -475,7 +1485,7 @@ def open_custom_theme_editor():
 
     editor = Toplevel(root)
     editor.title("Custom Theme Editor")
-    editor.geometry("320x400")
+    editor.geometry("440x400")
     editor.configure(bg=current_theme.get("bg", "#FFFFFF"))
 
     labels = {
@@ -513,6 +1523,11 @@ def open_custom_theme_editor():
     )
     save_btn.grid(row=len(labels), column=0, columnspan=2, pady=20)
 
+    # Live preview of the displayed sprite on the chosen background
+    preview = tk.Label(editor, bd=0)
+    preview.grid(row=0, column=2, rowspan=4, padx=10)
+    update_preview()
+
 def on_theme_change(new_theme_name):
     global current_theme_name, current_theme, custom_theme_colors
     if new_theme_name == CUSTOM_THEME_KEY:
@@ -545,8 +1560,22 @@ def on_theme_change(new_theme_name):
         if sel:
             on_list_select()
 
+def on_sprite_variant_change(label):
+    global sprite_variant
+    for variant, text in SPRITE_VARIANT_LABELS.items():
+        if text == label and variant != sprite_variant:
+            sprite_variant = variant
+            save_settings()
+            if prefetch_progress["running"]:
+                start_sprite_prefetch()
+            sel = pokemon_listbox.curselection()
+            if sel:
+                on_list_select()
+
 root = tk.Tk()
 root.title("Pokémon Randomizer Info")
+root.bind("<F12>", toggle_perf_panel)
+root.bind("<Map>", resume_sprite_animation)
 root.geometry("880x520")
 root.minsize(720, 440)
 
@@ -560,6 +1589,12 @@ theme_options = list(THEMES.keys()) + [CUSTOM_THEME_KEY]
 theme_menu = tk.OptionMenu(controls_frame, theme_var, *theme_options, command=on_theme_change)
 theme_menu.pack(side=tk.LEFT, padx=(0, 10))
 
+# Sprite variant dropdown
+sprite_variant_var = StringVar(value=SPRITE_VARIANT_LABELS[sprite_variant])
+sprite_variant_menu = tk.OptionMenu(controls_frame, sprite_variant_var, *SPRITE_VARIANT_LABELS.values(),
+                                    command=on_sprite_variant_change)
+sprite_variant_menu.pack(side=tk.LEFT, padx=(0, 10))
+
 # Load file button
 load_btn = tk.Button(controls_frame, text="Load Log File", command=open_file)
 load_btn.pack(side=tk.LEFT, padx=(0, 10))
@@ -568,44 +1603,83 @@ load_btn.pack(side=tk.LEFT, padx=(0, 10))
 clear_btn = tk.Button(controls_frame, text="Clear History", command=clear_history)
 clear_btn.pack(side=tk.LEFT, padx=(0, 10))
 
+# Loaded seeds; picking one switches to it without re-parsing
+seed_var = StringVar(value="No log")
+seed_menu = tk.OptionMenu(controls_frame, seed_var, "No log")
+seed_menu.pack(side=tk.LEFT, padx=(0, 10))
+
+# Cross-seed diff button
+diff_btn = tk.Button(controls_frame, text="Compare Seeds", command=open_diff_window)
+diff_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+# Re-read the log when its file changes on disk
+watch_var = tk.BooleanVar(value=False)
+watch_btn = tk.Checkbutton(controls_frame, text="Watch File", variable=watch_var, command=on_watch_toggle)
+watch_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+# Whole-log stats button
+stats_btn = tk.Button(controls_frame, text="Stats", command=open_stats_window)
+stats_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+# Team-vs-enemy type coverage button
+matchup_btn = tk.Button(controls_frame, text="Matchups", command=open_matchup_window)
+matchup_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+# Prefetch sprites button
+prefetch_btn = tk.Button(controls_frame, text="Prefetch Sprites", command=start_sprite_prefetch)
+prefetch_btn.pack(side=tk.LEFT, padx=(0, 10))
+
 # Search entry
 search_entry = tk.Entry(controls_frame)
 search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0,10))
 search_entry.bind("<Return>", search_pokemon)
+search_entry.bind("<KeyRelease>", on_search_key)
+search_entry.bind("<Down>", on_search_down)
+search_entry.bind("<Escape>", hide_search_results)
 
 # Search button
 search_btn = tk.Button(controls_frame, text="Search", command=search_pokemon)
 search_btn.pack(side=tk.LEFT)
 
+# Status line along the bottom
+status_var = StringVar(value="")
+status_label = tk.Label(root, textvariable=status_var, anchor="w")
+status_label.pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=(0, 4))
+
+# Progress of a log load (bytes read), shown above the status line while loading
+load_progress = ttk.Progressbar(root, mode="determinate", maximum=100)
+
 # Main frame horizontally divides listbox and output
 main_frame = tk.Frame(root)
 main_frame.pack(fill=tk.BOTH, expand=True, padx=8, pady=4)
 
+# Search-as-you-type results, shown under the controls only while there are any
+search_results = tk.Listbox(root, height=6)
+search_results.bind("<ButtonRelease-1>", on_search_result_pick)
+search_results.bind("<Return>", on_search_result_pick)
+search_results.bind("<Escape>", hide_search_results)
+
 # Listbox on the left
 pokemon_listbox = tk.Listbox(main_frame, height=25, width=30)
 pokemon_listbox.pack(side=tk.LEFT, fill=tk.Y)
-pokemon_listbox.bind("<<ListboxSelect>>", on_list_select)
+pokemon_listbox.bind("<<ListboxSelect>>", schedule_list_select)
 
 # Output text on the right
 output_text = tk.Text(main_frame, height=25)
 output_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(8,0))
-output_text._images = []
+output_text._sprite_frames = None
 
-# Load settings, history, default data
+# Settings are tiny and decide the theme, so they load before the first paint;
+# history and the default log load on a worker thread behind the open window.
 load_settings()
-load_history()
-
-# Load default log file if exists
-if os.path.exists(DEFAULT_LOG):
-    try:
-        pokemon_data = load_pokemon_data(DEFAULT_LOG)
-        messagebox.showinfo("Loaded", f"Loaded {len(pokemon_data)} Pokémon from {DEFAULT_LOG}")
-    except Exception as e:
-        messagebox.showerror("Error loading default log file", str(e))
-else:
-    pokemon_data = {}
-
-populate_listbox()
+sprite_variant_var.set(SPRITE_VARIANT_LABELS[sprite_variant])
+watch_var.set(log_watch_enabled)
+start_log_watch()
 apply_theme()
+status_var.set("Loading…")
+root.after_idle(lambda: mark_startup("first_paint"))
+open_history()
+threading.Thread(target=_startup_job, name="startup-load", daemon=True).start()
+root.after(STARTUP_POLL_MS, _poll_startup)
 
 root.mainloop()
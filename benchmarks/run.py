@@ -0,0 +1,288 @@
+# Benchmarks for the data layer and sprite fetching.
+#
+#   python -m benchmarks.run                      # 1k, 10k and 100k rows
+#   python -m benchmarks.run --sizes 1000 --out new.json --baseline old.json
+#
+# Results are written as JSON (median and min milliseconds per benchmark).
+# With --baseline, every benchmark that got slower than --threshold times
+# the baseline median is flagged, and the exit status is 1.
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from logtracker.analytics import StatTable
+from logtracker.atlas import SpriteAtlas, sprites_from_store, write_atlas
+from logtracker.formatting import calculate_bst, format_full_info
+from logtracker.history import JournalHistoryStore, SqliteHistoryStore
+from logtracker.listmodel import ListModel
+from logtracker.log import load_log, load_pokemon_data
+from logtracker.names import NameIndex
+from logtracker.search import SearchIndex
+from logtracker.sprites import SpriteStore
+
+from .sprite_server import SpriteServer
+from .synth import write_log
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def measure(fn, repeat=5, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return {"ms": statistics.median(times), "min": min(times), "repeat": repeat}
+
+
+def bench_log(results, workdir, rows, repeat):
+    path = write_log(os.path.join(workdir, f"synthetic_{rows}.log"), rows, full=True, seed=rows)
+    size = os.path.getsize(path)
+    cache_dir = os.path.join(workdir, "log_cache")
+    import logtracker.log as log_module
+    log_module.LOG_CACHE_DIR = cache_dir
+
+    def clear_cache():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    results[f"load_pokemon_data.parse.{rows}"] = measure(lambda: load_pokemon_data(path, use_cache=False), repeat)
+    results[f"load_pokemon_data.cold_cache.{rows}"] = measure(lambda: load_pokemon_data(path), repeat, clear_cache)
+    load_pokemon_data(path)
+    results[f"load_pokemon_data.warm_cache.{rows}"] = measure(lambda: load_pokemon_data(path), repeat)
+    results[f"load_log.streamed.{rows}"] = measure(
+        lambda: load_log(path, use_cache=False, on_rows=lambda *a: None), repeat)
+    results[f"load_pokemon_data.parse.{rows}"]["bytes"] = size
+    log = load_log(path)
+    data = log.data
+
+    results[f"stat_table.build.{rows}"] = measure(lambda: StatTable(data), repeat)
+    log.stat_table()
+    sample = list(data.values())[:1000]
+    results[f"calculate_bst.x{len(sample)}.{rows}"] = measure(lambda: [calculate_bst(r) for r in sample], repeat)
+    results[f"format_full_info.x{len(sample)}.{rows}"] = measure(
+        lambda: [format_full_info(r, log.percentiles(r)) for r in sample], repeat)
+
+    # key_from_display resolves a list label through the app's name index.
+    rng = random.Random(rows)
+    names = [str(r["NAME"]).strip().title() for r in rng.sample(list(data.values()), min(1000, len(data)))]
+    name_index = NameIndex()
+    results[f"name_index.build.{rows}"] = measure(lambda: name_index.rebuild("log", data), repeat)
+    results[f"key_from_display.x{len(names)}.{rows}"] = measure(lambda: [name_index.lookup(n) for n in names], repeat)
+
+    index = SearchIndex()
+
+    def build():
+        index.clear()
+        for k, v in data.items():
+            index.add_record(k, v)
+
+    results[f"search.build.{rows}"] = measure(build, max(1, repeat // 2))
+    queries = ["a", "ch", "mew", "saur", "levitate", "fire", "swift", "bulbsaur", "pikahcu"]
+    queries += [n.lower()[:4] for n in names[:20]]
+    results[f"search.query.x{len(queries)}.{rows}"] = measure(lambda: [index.query(q, 20) for q in queries], repeat)
+
+    # populate_listbox: the app's row model rebuilt from the log, and
+    # list_add: targeted inserts into a full model. Plus the Tk inserts when a
+    # display is available.
+    model = ListModel(("player", "enemy", "log"), pinned=("log",))
+    results[f"populate_listbox.model.{rows}"] = measure(lambda: model.rebuild({"log": data}), repeat)
+    added = [model.row("player", k, v) for k, v in list(data.items())[:1000]]
+
+    def insert_all():
+        for row in added:
+            model.insert(row)
+
+    results[f"list_add.x{len(added)}.{rows}"] = measure(insert_all, repeat, lambda: model.rebuild({"log": data}))
+    listbox = tk_listbox()
+    if listbox is not None:
+        model.rebuild({"log": data})
+        texts = [str(data[k].get("NAME", k)).strip() if k else "--- From Log ---" for _, _, k in model.rows]
+
+        def fill():
+            listbox.delete(0, "end")
+            listbox.insert("end", *texts)
+            listbox.update_idletasks()
+
+        results[f"populate_listbox.tk.{rows}"] = measure(fill, repeat)
+
+    bench_history(results, workdir, rows, data, repeat)
+
+
+def bench_history(results, workdir, rows, data, repeat):
+    entries = dict(list(data.items())[:rows])
+    half = len(entries) // 2
+    player = dict(list(entries.items())[:half])
+    enemy = dict(list(entries.items())[half:])
+    hist_dir = os.path.join(workdir, f"history_{rows}")
+    os.makedirs(hist_dir, exist_ok=True)
+    snapshot = os.path.join(hist_dir, "pokemon_history.json")
+
+    store = JournalHistoryStore(snapshot, durable=False)
+    results[f"save_history.snapshot.{rows}"] = measure(lambda: store.compact(player, enemy), repeat)
+    results[f"load_history.snapshot.{rows}"] = measure(store.load, repeat)
+    some = list(player.items())[:200]
+    results[f"record_history.journal.x{len(some)}.{rows}"] = measure(
+        lambda: [store.set("player", k, v) for k, v in some], repeat)
+    results[f"load_history.journal.{rows}"] = measure(store.load, repeat)
+    store.close()
+
+    db = SqliteHistoryStore(os.path.join(hist_dir, "pokemon_history.sqlite3"))
+    results[f"save_history.sqlite.{rows}"] = measure(lambda: db.compact(player, enemy), repeat)
+    results[f"record_history.sqlite.x{len(some)}.{rows}"] = measure(
+        lambda: [db.set("player", k, v) for k, v in some], repeat)
+    results[f"load_history.sqlite.{rows}"] = measure(db.load, repeat)
+    db.close()
+
+
+def bench_sprites(results, workdir, count, latencies, repeat):
+    for latency in latencies:
+        with SpriteServer(latency=latency) as server:
+            cache_dir = os.path.join(workdir, f"sprites_{latency}")
+            store = SpriteStore(cache_dir, 256 * 1024 * 1024, base_url=server.base_url)
+            label = f"{int(latency * 1000)}ms"
+            for dex in range(1, count + 1):
+                server.blob(dex)
+
+            def reset():
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                store.load_index()
+
+            results[f"sprites.prefetch.x{count}.{label}"] = measure(
+                lambda: store.prefetch(range(1, count + 1)), repeat, reset)
+            results[f"sprites.fetch_cold.x20.{label}"] = measure(
+                lambda: [store.fetch(d) for d in range(1, 21)], repeat, reset)
+            store.prefetch(range(1, count + 1))
+            results[f"sprites.fetch_cached.x{count}.{label}"] = measure(
+                lambda: [store.fetch(d) for d in range(1, count + 1)], repeat)
+
+
+def bench_atlas(results, workdir, count, repeat):
+    # First view of a sprite: decoding the cached PNG against slicing the
+    # pre-decoded atlas.
+    from io import BytesIO
+    from PIL import Image
+    with SpriteServer() as server:
+        store = SpriteStore(os.path.join(workdir, "sprites_atlas"), 256 * 1024 * 1024, base_url=server.base_url)
+        store.prefetch(range(1, count + 1))
+    path = os.path.join(workdir, "sprites.atlas")
+    results[f"atlas.build.x{count}"] = measure(lambda: write_atlas(path, sprites_from_store(store)), 1)
+    blobs = [store.get(d) for d in range(1, count + 1)]
+    results[f"sprites.decode.x{count}"] = measure(
+        lambda: [Image.open(BytesIO(b)).convert("RGBA").load() for b in blobs], repeat)
+    atlas = SpriteAtlas(path)
+    results[f"atlas.read.x{count}"] = measure(
+        lambda: [atlas.image(d).convert("RGBA") for d in range(1, count + 1)], repeat)
+    results[f"atlas.build.x{count}"]["bytes"] = os.path.getsize(path)
+
+
+_listbox = None
+
+
+def tk_listbox():
+    global _listbox
+    if _listbox is None:
+        try:
+            import tkinter as tk
+            root = tk.Tk()
+            root.withdraw()
+            _listbox = tk.Listbox(root)
+        except Exception:
+            _listbox = False
+    return _listbox or None
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except Exception:
+        return ""
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, new in sorted(results.items()):
+        old = baseline.get(name)
+        if not old or not old.get("ms"):
+            continue
+        ratio = new["ms"] / old["ms"]
+        new["baseline_ms"] = old["ms"]
+        new["ratio"] = round(ratio, 3)
+        if ratio > threshold:
+            new["regression"] = True
+            regressions.append((name, old["ms"], new["ms"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Benchmark log loading, search, history and sprite fetching.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated row counts of the synthetic logs")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sprites", type=int, default=300, help="sprites per fetch benchmark (0 to skip)")
+    parser.add_argument("--latency", default="0,0.02", help="comma-separated sprite server latencies in seconds")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio flagged as a regression")
+    parser.add_argument("--keep", action="store_true", help="keep the generated files")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="logtracker-bench-")
+    results = {}
+    try:
+        for rows in (int(s) for s in args.sizes.split(",") if s):
+            print(f"logs: {rows} rows…", file=sys.stderr)
+            bench_log(results, workdir, rows, args.repeat)
+        if args.sprites:
+            print("sprites…", file=sys.stderr)
+            bench_sprites(results, workdir, args.sprites,
+                          [float(x) for x in args.latency.split(",") if x], max(1, args.repeat // 2))
+            bench_atlas(results, workdir, args.sprites, args.repeat)
+    finally:
+        if args.keep:
+            print(f"files kept in {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f).get("results", {}), args.threshold)
+
+    out = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "threshold": args.threshold,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(out, f, indent=2)
+
+    width = max(len(n) for n in results) if results else 0
+    for name, r in results.items():
+        extra = f"  x{r['ratio']:.2f}" if "ratio" in r else ""
+        flag = "  REGRESSION" if r.get("regression") else ""
+        print(f"{name:<{width}}  {r['ms']:10.2f} ms{extra}{flag}")
+    print(f"wrote {args.out}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) over x{args.threshold}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# Local stand-in for raw.githubusercontent.com/PokeAPI/sprites: serves the
+# same path layout (pokemon/{dex}.png, pokemon/shiny/..., pokemon/back/...,
+# pokemon/versions/generation-v/black-white/animated/{dex}.gif) with generated
+# images and a configurable per-request latency.
+import argparse
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+SPRITE_PATH_RE = re.compile(
+    r"^/pokemon/(?:(shiny|back)/|versions/generation-v/black-white/animated/)?(\d+)\.(png|gif)$")
+
+
+def make_sprite(dex, fmt="png", frames=4):
+    from PIL import Image, ImageDraw
+    color = ((dex * 67) % 256, (dex * 131) % 256, (dex * 29) % 256, 255)
+    images = []
+    for i in range(frames if fmt == "gif" else 1):
+        img = Image.new("RGBA", (96, 96), (0, 0, 0, 0))
+        ImageDraw.Draw(img).ellipse((16 + i * 4, 16, 80 - i * 4, 80), fill=color)
+        images.append(img)
+    buf = BytesIO()
+    if fmt == "gif":
+        images[0].save(buf, "GIF", save_all=True, append_images=images[1:], duration=100, loop=0)
+    else:
+        images[0].save(buf, "PNG")
+    return buf.getvalue()
+
+
+class _Server(ThreadingHTTPServer):
+    # The default listen backlog of 5 overflows when a prefetch opens 16
+    # connections at once, and the extra connects stall for a SYN retry.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class SpriteServer:
+    # with SpriteServer(latency=0.05) as srv: SpriteStore(base_url=srv.base_url)
+    def __init__(self, latency=0.0, port=0, host="127.0.0.1", fail_every=0):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self._blobs = {}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this,
+            # Nagle plus delayed ACKs add ~40 ms to every keep-alive request.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    n = server.requests
+                if server.latency:
+                    time.sleep(server.latency)
+                m = SPRITE_PATH_RE.match(self.path)
+                if not m or (server.fail_every and n % server.fail_every == 0):
+                    self.send_response(404 if not m else 503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = server.blob(int(m.group(2)), m.group(3))
+                self.send_response(200)
+                self.send_header("Content-Type", "image/" + m.group(3))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = _Server((host, port), Handler)
+        self.base_url = f"http://{host}:{self.httpd.server_address[1]}/pokemon"
+        self._thread = None
+
+    def blob(self, dex, fmt="png"):
+        key = (dex, fmt)
+        with self._lock:
+            body = self._blobs.get(key)
+        if body is None:
+            body = make_sprite(dex, fmt)
+            with self._lock:
+                self._blobs[key] = body
+        return body
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="sprite-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve generated sprites in the PokeAPI layout.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    args = parser.parse_args(argv)
+    server = SpriteServer(args.latency, args.port)
+    print(f"Serving sprites at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
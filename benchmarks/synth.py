@@ -0,0 +1,64 @@
+# Synthetic Universal Pokemon Randomizer logs of any size, in the layout the
+# real randomizer writes (padded pipe table, "--Section--" headers).
+import random
+
+TYPES = ("NORMAL", "FIRE", "WATER", "ELECTRIC", "GRASS", "ICE", "FIGHTING", "POISON", "GROUND",
+         "FLYING", "PSYCHIC", "BUG", "ROCK", "GHOST", "DRAGON", "DARK", "STEEL", "FAIRY")
+ABILITIES = ("OVERGROW", "BLAZE", "TORRENT", "STATIC", "LEVITATE", "INTIMIDATE", "SWIFT SWIM",
+             "CHLOROPHYLL", "SAND VEIL", "KEEN EYE", "PRESSURE", "STURDY", "SYNCHRONIZE", "CLEAR BODY")
+ITEMS = ("", "", "", "ORAN BERRY", "LIGHT BALL", "MIRACLE SEED", "EVERSTONE")
+MOVES = ("TACKLE", "GROWL", "EMBER", "WATER GUN", "THUNDERSHOCK", "VINE WHIP", "BITE", "SURF",
+         "PSYCHIC", "EARTHQUAKE", "ICE BEAM", "FLAMETHROWER", "HYPER BEAM", "REST")
+SYLLABLES = ("bul", "ba", "saur", "char", "man", "der", "pi", "ka", "chu", "squir", "tle", "ee",
+             "vee", "gy", "ra", "dos", "mew", "two", "lu", "gia", "ho", "oh", "ze", "kro", "rom")
+
+
+def species_names(rows, seed=0):
+    rng = random.Random(seed)
+    names, seen = [], set()
+    while len(names) < rows:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).upper()
+        if name in seen:
+            name = f"{name}{len(names)}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def make_log(rows, full=True, seed=0):
+    rng = random.Random(seed)
+    names = species_names(rows, seed)
+    width = max(10, max(len(n) for n in names))
+    out = ["Randomizer Version: 4.6.1", f"Random Seed: {seed}", "", "--Pokemon Base Stats & Types--",
+           f"NUM|{'NAME':<{width}}|TYPE             |  HP| ATK| DEF|SATK|SDEF| SPD|ABILITY1        |ABILITY2        |ABILITY3        |ITEM"]
+    for i, name in enumerate(names, 1):
+        types = "/".join(rng.sample(TYPES, rng.choice((1, 2))))
+        stats = "|".join(f"{rng.randint(5, 200):>4}" for _ in range(6))
+        abilities = "|".join(f"{rng.choice(ABILITIES):<16}" for _ in range(3))
+        out.append(f"{i:>3}|{name:<{width}}|{types:<17}|{stats}|{abilities}|{rng.choice(ITEMS)}")
+    if full:
+        out += ["", "--Randomized Evolutions--"]
+        out += [f"{names[i]:<{width}} -> {names[i + 1]}" for i in range(0, rows - 1, 3)]
+        out += ["", "--Pokemon Movesets--"]
+        for i, name in enumerate(names, 1):
+            out.append(f"{i:03d} {name}")
+            out += [f"Level {lvl} : {rng.choice(MOVES)}" for lvl in sorted(rng.sample(range(1, 60), 4))]
+            out.append("")
+        out.append("--Trainers Pokemon--")
+        for t in range(1, rows // 4 + 2):
+            team = ", ".join(f"{rng.choice(names)} Lv{rng.randint(2, 70)}" for _ in range(rng.randint(1, 6)))
+            out.append(f"#{t} (TRAINER {t}) - {team}")
+        out += ["", "--Wild Pokemon--"]
+        for s in range(1, rows // 10 + 2):
+            out.append(f"Set #{s} - Route {s} Grass/Cave (rate=21)")
+            for _ in range(rng.randint(3, 10)):
+                lo = rng.randint(2, 60)
+                out.append(f"{rng.choice(names):<{width}} Lv{lo}-{lo + rng.randint(0, 5)}")
+        out += ["", "--TM Moves--"] + [f"TM{i:02d} {m}" for i, m in enumerate(MOVES, 1)]
+    return "\n".join(out) + "\n"
+
+
+def write_log(path, rows, full=True, seed=0):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(make_log(rows, full, seed))
+    return path
@@ -0,0 +1,5 @@
+from .formatting import calculate_bst, format_enemy_info, format_full_info, format_log_context
+from .history import open_history_store
+from .log import PokemonLog, load_log, load_pokemon_data
+from .records import PokemonRecord, make_record, record_from_dict
+from .search import SearchIndex
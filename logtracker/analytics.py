@@ -0,0 +1,73 @@
+import numpy as np
+
+from .records import STAT_COLUMNS, record_from_dict, stat_column
+
+
+def split_types(type_field):
+    return tuple(t.strip().upper() for t in str(type_field).split("/") if t.strip())
+
+
+class StatTable:
+    # Column-oriented copy of a whole log's stats, so rankings, percentiles
+    # and type filters run as array operations instead of per-record loops.
+    def __init__(self, data):
+        records = [record_from_dict(v) for v in data.values()]
+        self.keys = list(data)
+        self.names = [str(r.get("NAME", k)).strip() for k, r in zip(self.keys, records)]
+        self.row = {k: i for i, k in enumerate(self.keys)}
+        self.stats = np.array([r.stats + (r.bst,) for r in records], dtype=np.int32).reshape(-1, len(STAT_COLUMNS))
+        self._sorted = np.sort(self.stats, axis=0)
+
+        row_types = [split_types(r.get("TYPE", "")) for r in records]
+        self.type_names = sorted({t for ts in row_types for t in ts})
+        col = {t: i for i, t in enumerate(self.type_names)}
+        self.type_mask = np.zeros((len(records), len(self.type_names)), dtype=bool)
+        for i, ts in enumerate(row_types):
+            for t in ts:
+                self.type_mask[i, col[t]] = True
+
+    def __len__(self):
+        return len(self.keys)
+
+    def column(self, stat):
+        column = stat_column(stat)
+        if column is None:
+            raise ValueError(f"unknown stat {stat!r}")
+        return STAT_COLUMNS.index(column)
+
+    def percentiles_of(self, values):
+        # Share of the log (0-100) at or below each value, one per column.
+        n = len(self.keys)
+        if n == 0:
+            return np.zeros(len(STAT_COLUMNS))
+        values = np.asarray(values, dtype=np.int32)
+        below = np.array([np.searchsorted(self._sorted[:, c], values[c], side="right")
+                          for c in range(len(STAT_COLUMNS))])
+        return below * 100.0 / n
+
+    def percentiles(self, record):
+        record = record_from_dict(record)
+        return dict(zip(STAT_COLUMNS, self.percentiles_of(record.stats + (record.bst,))))
+
+    def rank(self, key, stat="BST"):
+        c = self.column(stat)
+        return int((self.stats[:, c] > self.stats[self.row[key], c]).sum()) + 1
+
+    def mask_for_type(self, type_name):
+        if not type_name:
+            return np.ones(len(self.keys), dtype=bool)
+        type_name = type_name.upper()
+        if type_name not in self.type_names:
+            return np.zeros(len(self.keys), dtype=bool)
+        return self.type_mask[:, self.type_names.index(type_name)]
+
+    def top(self, stat="BST", n=20, type_name=None, lowest=False):
+        c = self.column(stat)
+        idx = np.flatnonzero(self.mask_for_type(type_name))
+        values = self.stats[idx, c]
+        order = np.argsort(values if lowest else -values, kind="stable")[:n]
+        return [(self.keys[i], self.names[i], int(self.stats[i, c])) for i in idx[order]]
+
+    def type_counts(self):
+        counts = self.type_mask.sum(axis=0)
+        return sorted(zip(self.type_names, (int(c) for c in counts)), key=lambda tc: (-tc[1], tc[0]))
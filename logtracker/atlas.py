@@ -0,0 +1,191 @@
+# Packed sprite atlas: every sprite of a dex pre-decoded into one file, read
+# through mmap. Layout (little-endian):
+#
+#   header  8s magic, I version, I entry count, Q index offset, Q index size
+#   frames  raw pixels, each 16-byte aligned: RGBA (4 bytes per pixel), or
+#           P (1 byte per pixel) preceded by a 1024-byte RGBA palette
+#   index   JSON {"entries": [[dex, variant, offset, width, height, mode], ...]}
+#
+# Frames are handed to PIL with Image.frombuffer over a memoryview of the
+# map, so reading a sprite copies nothing and decodes nothing.
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+
+from .sprites import ANIMATED_VARIANTS, SpriteStore
+
+ATLAS_MAGIC = b"LTATLAS1"
+ATLAS_VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+ALIGN = 16
+PALETTE_BYTES = 256 * 4
+
+
+class SpriteAtlas:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, count, index_offset, index_size = HEADER.unpack_from(self._mm, 0)
+            if magic != ATLAS_MAGIC or version != ATLAS_VERSION:
+                raise ValueError(f"{path} is not a sprite atlas (version {ATLAS_VERSION})")
+            index = json.loads(self._mm[index_offset:index_offset + index_size])
+        except Exception:
+            self.close()
+            raise
+        self._view = memoryview(self._mm)
+        self.entries = {(dex, variant): (offset, width, height, mode)
+                        for dex, variant, offset, width, height, mode in index["entries"]}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def frame(self, dex_num, variant="front"):
+        # (mode, (width, height), pixels, palette) as memoryviews into the map,
+        # or None.
+        entry = self.entries.get((dex_num, variant))
+        if entry is None:
+            return None
+        offset, width, height, mode = entry
+        if mode == "P":
+            palette = self._view[offset:offset + PALETTE_BYTES]
+            offset += PALETTE_BYTES
+            return mode, (width, height), self._view[offset:offset + width * height], palette
+        return mode, (width, height), self._view[offset:offset + width * height * 4], None
+
+    def image(self, dex_num, variant="front"):
+        frame = self.frame(dex_num, variant)
+        if frame is None:
+            return None
+        from PIL import Image
+        mode, size, pixels, palette = frame
+        img = Image.frombuffer(mode, size, pixels, "raw", mode, 0, 1)
+        if palette is not None:
+            img.putpalette(bytes(palette), "RGBA")
+        return img
+
+    def close(self):
+        self._file.close()
+        try:
+            if getattr(self, "_view", None) is not None:
+                self._view.release()
+            if getattr(self, "_mm", None) is not None:
+                self._mm.close()
+        except BufferError:
+            pass  # images still point into the map; it is unmapped with them
+
+
+def _frame_bytes(img):
+    # Indexed when the sprite fits in 256 colours (a quarter of the size),
+    # otherwise straight RGBA.
+    img = img.convert("RGBA")
+    if img.getcolors(256) is not None:
+        indexed = img.quantize(256, method=2)  # FASTOCTREE keeps alpha
+        palette = indexed.getpalette("RGBA") or []
+        palette = bytes(palette) + bytes(PALETTE_BYTES - len(palette))
+        if indexed.convert("RGBA").tobytes() == img.tobytes():
+            return "P", img.size, palette + indexed.tobytes()
+    return "RGBA", img.size, img.tobytes()
+
+
+def write_atlas(path, sprites):
+    # sprites: iterable of (dex, variant, PIL image). Written to a temporary
+    # file and swapped in, so a running app never sees a half-written atlas.
+    entries = []
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(bytes(HEADER.size))
+        for dex, variant, img in sprites:
+            pad = -f.tell() % ALIGN
+            f.write(bytes(pad))
+            offset = f.tell()
+            mode, (width, height), data = _frame_bytes(img)
+            f.write(data)
+            entries.append([int(dex), variant, offset, width, height, mode])
+        index = json.dumps({"entries": entries}, separators=(",", ":")).encode("utf-8")
+        index_offset = f.tell()
+        f.write(index)
+        f.seek(0)
+        f.write(HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, len(entries), index_offset, len(index)))
+    os.replace(tmp, path)
+    return len(entries)
+
+
+def sprites_from_store(store, dex_numbers=None, variants=None, fetch=False):
+    # Decoded sprites from a SpriteStore's disk cache; with fetch=True, the
+    # ones it lacks are downloaded first. Animated variants are left out, the
+    # atlas holds still frames.
+    from io import BytesIO
+    from PIL import Image
+    if fetch and dex_numbers is not None:
+        for variant in variants or ("front",):
+            store.prefetch(dex_numbers, variant)
+    keys = []
+    for key in list(store.index):
+        dex, _, variant = key.partition(":")
+        if not dex.isdigit() or variant in ANIMATED_VARIANTS:
+            continue
+        if (dex_numbers is None or int(dex) in dex_numbers) and (variants is None or variant in variants):
+            keys.append((int(dex), variant))
+    for dex, variant in sorted(keys):
+        blob = store.get(dex, variant)
+        if blob is None:
+            continue
+        try:
+            img = Image.open(BytesIO(blob))
+            img.load()
+        except Exception:
+            continue
+        yield dex, variant, img
+
+
+def _parse_dex_range(text):
+    out = set()
+    for part in text.split(","):
+        lo, _, hi = part.partition("-")
+        out.update(range(int(lo), int(hi or lo) + 1))
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m logtracker.atlas", description="Build or inspect a sprite atlas.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="pack cached (or downloaded) sprites into an atlas file")
+    p.add_argument("out")
+    p.add_argument("--cache", default="sprite_cache", help="sprite cache directory to read")
+    p.add_argument("--dex", help="dex numbers to include, e.g. 1-151,250 (default: all cached)")
+    p.add_argument("--variant", action="append", help="variants to include (default: all cached)")
+    p.add_argument("--fetch", action="store_true", help="download sprites missing from the cache (needs --dex)")
+    p.add_argument("--base-url", help="sprite server to fetch from")
+    p = sub.add_parser("info", help="list what an atlas contains")
+    p.add_argument("atlas")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        atlas = SpriteAtlas(args.atlas)
+        modes = {}
+        for _, _, _, mode in atlas.entries.values():
+            modes[mode] = modes.get(mode, 0) + 1
+        variants = sorted({v for _, v in atlas.entries})
+        print(f"{len(atlas)} sprites, {os.path.getsize(args.atlas)} bytes, variants {', '.join(variants)}, "
+              + ", ".join(f"{n} {m}" for m, n in sorted(modes.items())))
+        return 0
+
+    store = SpriteStore(args.cache, max_bytes=1 << 40, base_url=args.base_url)
+    store.load_index()
+    dex_numbers = _parse_dex_range(args.dex) if args.dex else None
+    count = write_atlas(args.out, sprites_from_store(store, dex_numbers, args.variant, args.fetch))
+    store.save_index()
+    print(f"wrote {count} sprites to {args.out}")
+    return 0 if count else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import argparse
+import json
+import sys
+
+from . import perf
+from .formatting import format_enemy_info, format_full_info, format_log_context, format_seed_diff
+from .log import load_log
+from .names import NameIndex
+from .records import STAT_COLUMNS, stat_column
+from .search import SearchIndex
+from .workspace import Workspace
+
+
+def _load_all(paths, use_cache):
+    for path in paths:
+        try:
+            yield path, load_log(path, use_cache)
+        except Exception as e:
+            print(f"{path}: error: {e}", file=sys.stderr)
+
+
+def _header(path, many):
+    if many:
+        print(f"== {path} ==")
+
+
+def cmd_lookup(args, logs):
+    found = False
+    for path, log in logs:
+        _header(path, len(args.logs) > 1)
+        names = NameIndex(("log",))
+        names.rebuild("log", log.data)
+        for name in args.names:
+            _, key = names.lookup(name)
+            if key is None:
+                print(f"{name}: not found")
+                continue
+            found = True
+            data = log.data[key]
+            if args.enemy:
+                print(format_enemy_info(data) + format_log_context(log, key, full=False))
+            else:
+                print(format_full_info(data, log.percentiles(data)) + format_log_context(log, key))
+    return 0 if found else 1
+
+
+def cmd_rank(args, logs):
+    if stat_column(args.stat) is None:
+        print(f"unknown stat {args.stat!r}; expected one of {', '.join(STAT_COLUMNS)}", file=sys.stderr)
+        return 2
+    for path, log in logs:
+        _header(path, len(args.logs) > 1)
+        rows = log.stat_table().top(args.stat, args.top, args.type, args.lowest)
+        for i, (key, name, value) in enumerate(rows, 1):
+            print(f"{i:>3}. {name:<14} {value:>4}")
+    return 0
+
+
+def cmd_dump(args, logs):
+    if args.json:
+        out = {path: {k: v.to_dict() for k, v in log.data.items()} for path, log in logs}
+        json.dump(out if len(args.logs) > 1 else next(iter(out.values()), {}),
+                  sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+    for path, log in logs:
+        _header(path, len(args.logs) > 1)
+        for key, data in log.data.items():
+            print(f"{key}\t{data.get('NAME', key)}\t{data.get('TYPE', '')}\t{data.bst}")
+    return 0
+
+
+def cmd_search(args, logs):
+    for path, log in logs:
+        _header(path, len(args.logs) > 1)
+        index = SearchIndex()
+        for k, v in log.data.items():
+            index.add_record(k, v)
+        for key, _ in index.query(args.text, args.limit):
+            print(f"{key}\t{log.data[key].get('NAME', key)}")
+    return 0
+
+
+def cmd_diff(args, logs):
+    ws = Workspace()
+    for _, log in logs:
+        ws.add(log)
+    paths = list(ws.logs)
+    if len(paths) < 2:
+        print("diff needs at least two logs that load", file=sys.stderr)
+        return 2
+    base = paths[0]
+    for other in paths[1:]:
+        print(format_seed_diff(ws.diff(base, other), ws.label(base), ws.label(other),
+                               ws.get(base).data, ws.get(other).data))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="logtracker", description="Query Universal Pokemon Randomizer logs.")
+    parser.add_argument("--no-cache", action="store_true", help="always re-parse instead of using log_cache/")
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace of the run to FILE")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("lookup", help="show the details of one or more Pokemon")
+    p.add_argument("logs", nargs="+")
+    p.add_argument("-n", "--name", dest="names", action="append", required=True)
+    p.add_argument("--enemy", action="store_true", help="short enemy view")
+    p.set_defaults(func=cmd_lookup)
+
+    p = sub.add_parser("rank", help="top Pokemon by a stat")
+    p.add_argument("logs", nargs="+")
+    p.add_argument("--stat", default="BST")
+    p.add_argument("--top", type=int, default=20)
+    p.add_argument("--type")
+    p.add_argument("--lowest", action="store_true")
+    p.set_defaults(func=cmd_rank)
+
+    p = sub.add_parser("dump", help="print the stats table")
+    p.add_argument("logs", nargs="+")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_dump)
+
+    p = sub.add_parser("search", help="search names, types and abilities")
+    p.add_argument("logs", nargs="+")
+    p.add_argument("-q", "--text", required=True)
+    p.add_argument("--limit", type=int, default=20)
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("diff", help="type and stat changes from the first log to each of the others")
+    p.add_argument("logs", nargs="+")
+    p.set_defaults(func=cmd_diff)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    perf.enable(bool(args.trace))
+    try:
+        # Logs are loaded one at a time so dozens of seeds don't sit in memory.
+        return args.func(args, _load_all(args.logs, not args.no_cache))
+    finally:
+        if args.trace:
+            perf.export_chrome_trace(args.trace)
+            print(perf.format_summary(), file=sys.stderr, end="")
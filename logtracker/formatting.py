@@ -0,0 +1,101 @@
+from .records import record_from_dict
+
+
+def calculate_bst(data):
+    return record_from_dict(data).bst
+
+
+def format_full_info(data, percentiles=None):
+    lines = []
+    order = ["NUM","NAME","TYPE","HP","ATK","DEF","SPE","SPD","SATK","SDEF","ABILITY1","ABILITY2","ABILITY3","ITEM"]
+    pct = percentiles or {}
+    seen = set()
+    for k in order:
+        if k in data and str(data[k]).strip() != "":
+            p = pct.get("SPE" if k == "SPD" else k)
+            lines.append(f"{k}: {data[k]}" + (f"  (p{p:.0f})" if p is not None else ""))
+            seen.add(k)
+    for k, v in data.items():
+        if k not in seen and str(v).strip() != "":
+            lines.append(f"{k}: {v}")
+    bst_pct = f"  (p{pct['BST']:.0f})" if "BST" in pct else ""
+    lines.append(f"BST (Base Stat Total): {calculate_bst(data)}{bst_pct}")
+    return "\n".join(lines) + "\n"
+
+
+def format_enemy_info(data):
+    name = str(data.get("NAME", "")).strip()
+    typ  = str(data.get("TYPE", "Unknown")).strip()
+    return f"{name}\nType: {typ}\n"
+
+
+def format_log_context(log, key, full=True):
+    lines = []
+    evo = log.section("evolutions")
+    if evo:
+        if key in evo["from"]:
+            lines.append("Evolves from: " + ", ".join(evo["from"][key]))
+        if key in evo["to"]:
+            lines.append("Evolves into: " + ", ".join(evo["to"][key]))
+    if full:
+        moves = (log.section("movesets") or {}).get(key)
+        if moves:
+            lines.append("Level-up moves: " + ", ".join(f"{lvl} {mv}" for lvl, mv in moves))
+    wild = (log.section("wild") or {}).get(key)
+    if wild:
+        lines.append("Wild: " + "; ".join(
+            f"{area} (Lv{lo})" if lo == hi else f"{area} (Lv{lo}-{hi})" for area, (lo, hi) in wild.items()))
+    if not full:
+        tr = log.section("trainers")
+        if tr and key in tr["by_species"]:
+            names = list(dict.fromkeys(tr["trainers"][t]["name"] for t in tr["by_species"][key]))
+            lines.append("Trainers: " + ", ".join(names))
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def format_seed_diff(diff, label_a, label_b, names_a=None, names_b=None):
+    def name(k, names):
+        return str((names or {}).get(k, {}).get("NAME", k)).strip()
+
+    lines = [f"{label_a} -> {label_b}", ""]
+    lines.append(f"Type changes ({len(diff['types'])}):")
+    for _, nm, old, new in sorted(diff["types"], key=lambda t: t[1]):
+        lines.append(f"  {nm}: {old} -> {new}")
+    lines.append("")
+    lines.append(f"Stat changes ({len(diff['stats'])}):")
+    for _, nm, changed, old_bst, new_bst in sorted(diff["stats"], key=lambda t: t[1]):
+        parts = [f"{s} {x}->{y} ({y - x:+d})" for s, x, y in changed]
+        lines.append(f"  {nm}: " + ", ".join(parts) + f"; BST {old_bst}->{new_bst} ({new_bst - old_bst:+d})")
+    for title, keys, names in ((f"Only in {label_a}", diff["only_a"], names_a),
+                               (f"Only in {label_b}", diff["only_b"], names_b)):
+        if keys:
+            lines.append("")
+            lines.append(f"{title} ({len(keys)}): " + ", ".join(sorted(name(k, names) for k in keys)))
+    return "\n".join(lines) + "\n"
+
+
+def format_matchup_answers(answers):
+    # answers: [(key, name, score)] from MatchupModel.answers
+    if not answers:
+        return ""
+    return "Best answers on your team: " + ", ".join(f"{name.title()} ({score:+g})" for _, name, score in answers) + "\n"
+
+
+def format_coverage(summary):
+    lines = [f"Team: {summary['players']}   Enemies recorded: {summary['enemies']}", ""]
+    total = summary["ahead"] + summary["even"] + summary["behind"]
+    if not total or not summary["players"]:
+        lines.append("Record Player and Enemy Pokemon to see type coverage.")
+        return "\n".join(lines) + "\n"
+    lines.append(f"Best type matchup per enemy: ahead {summary['ahead']} ({summary['ahead'] * 100 / total:.0f}%), "
+                 f"even {summary['even']}, behind {summary['behind']}")
+    lines.append("")
+    lines.append("Hardest enemy typings (count, best answer):")
+    for label, count, best in summary["threats"]:
+        lines.append(f"  {label.title():<20}{count:>6}{best:>+6g}")
+    if summary["best"]:
+        lines.append("")
+        lines.append("Team typings ahead of the most enemies (members, enemies):")
+        for label, members, wins in summary["best"]:
+            lines.append(f"  {label.title():<20}{members:>6}{wins:>8}")
+    return "\n".join(lines) + "\n"
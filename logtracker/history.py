@@ -0,0 +1,243 @@
+import json
+import os
+import shutil
+import sqlite3
+import threading
+
+ROLES = ("player", "enemy")
+
+
+def _to_json(obj):
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def write_snapshot(path, player, enemy):
+    # Written to a temporary file and swapped in, so a crash mid-write leaves
+    # the previous snapshot intact.
+    data = {"player_history": player, "enemy_history": enemy}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=_to_json)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot(path):
+    if not os.path.exists(path):
+        return {}, {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return dict(data.get("player_history", {})), dict(data.get("enemy_history", {}))
+
+
+def apply_op(state, op):
+    role = op.get("role")
+    if role not in state:
+        return
+    kind = op.get("op")
+    if kind == "set":
+        state[role][op["key"]] = op["data"]
+    elif kind == "del":
+        state[role].pop(op["key"], None)
+    elif kind == "clear":
+        state[role].clear()
+
+
+class JournalHistoryStore:
+    # The JSON snapshot (same layout as the old pokemon_history.json) plus an
+    # append-only journal with one line per change. Each change costs one small
+    # append; the snapshot is only rewritten when the journal is compacted.
+    # Replaying set/del/clear is idempotent, so a journal that outlived its
+    # compaction can safely be replayed again.
+    backend = "journal"
+
+    def __init__(self, snapshot_path, journal_path=None, compact_after=500, durable=True):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + ".journal"
+        self.compact_after = compact_after
+        self.durable = durable
+        self.pending = 0
+        self._journal = None
+        self._lock = threading.Lock()
+        self._compactor = None
+
+    @property
+    def _old_journal_path(self):
+        return self.journal_path + ".old"
+
+    def load(self):
+        self.wait()
+        try:
+            player, enemy = read_snapshot(self.snapshot_path)
+        except (OSError, ValueError):
+            player, enemy = {}, {}
+        state = {"player": player, "enemy": enemy}
+        # Appends wait for the replay, so a torn tail is never truncated
+        # after a new line has been written behind it.
+        with self._lock:
+            self.pending = 0
+            for path in (self._old_journal_path, self.journal_path):
+                self.pending += self._replay(path, state)
+        return state["player"], state["enemy"]
+
+    def _replay(self, path, state):
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        valid = 0
+        with open(path, "rb") as f:
+            for raw in f:
+                # A torn final line (crash mid-append) has no newline or does
+                # not parse; everything before it is kept.
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    op = json.loads(raw)
+                except ValueError:
+                    break
+                apply_op(state, op)
+                valid += len(raw)
+                count += 1
+        if valid != os.path.getsize(path):
+            with open(path, "r+b") as f:
+                f.truncate(valid)
+        return count
+
+    def _append(self, op):
+        line = json.dumps(op, ensure_ascii=False, default=_to_json) + "\n"
+        with self._lock:
+            if self._journal is None:
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+            self._journal.write(line)
+            self._journal.flush()
+            if self.durable:
+                os.fsync(self._journal.fileno())
+            self.pending += 1
+
+    def set(self, role, key, data):
+        self._append({"op": "set", "role": role, "key": key, "data": data})
+
+    def delete(self, role, key):
+        self._append({"op": "del", "role": role, "key": key})
+
+    def clear(self, roles=ROLES):
+        for role in roles:
+            self._append({"op": "clear", "role": role})
+
+    def maybe_compact(self, player, enemy):
+        if self.pending >= self.compact_after:
+            self.compact(player, enemy, background=True)
+
+    def compact(self, player, enemy, background=False):
+        # Rotate the journal first so new changes keep appending while the
+        # snapshot is written; the rotated journal is removed once the
+        # snapshot that covers it is in place.
+        self.wait()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if os.path.exists(self.journal_path):
+                if os.path.exists(self._old_journal_path):
+                    # An earlier compaction never finished; keep its changes.
+                    with open(self._old_journal_path, "ab") as dst, open(self.journal_path, "rb") as src:
+                        shutil.copyfileobj(src, dst)
+                    os.remove(self.journal_path)
+                else:
+                    os.replace(self.journal_path, self._old_journal_path)
+            self.pending = 0
+        player, enemy = dict(player), dict(enemy)
+
+        def run():
+            write_snapshot(self.snapshot_path, player, enemy)
+            try:
+                os.remove(self._old_journal_path)
+            except OSError:
+                pass
+
+        if background:
+            self._compactor = threading.Thread(target=run, name="history-compact", daemon=True)
+            self._compactor.start()
+        else:
+            run()
+
+    def wait(self):
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def close(self):
+        self.wait()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+
+class SqliteHistoryStore:
+    # One row per entry in a WAL-mode database; every change is a single
+    # upsert or delete, so there is nothing to compact.
+    backend = "sqlite"
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.pending = 0
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            "role TEXT NOT NULL, key TEXT NOT NULL, data TEXT NOT NULL, PRIMARY KEY (role, key))"
+        )
+
+    def load(self):
+        state = {"player": {}, "enemy": {}}
+        for role, key, data in self._db.execute("SELECT role, key, data FROM history"):
+            if role in state:
+                state[role][key] = json.loads(data)
+        return state["player"], state["enemy"]
+
+    def set(self, role, key, data):
+        self._db.execute(
+            "INSERT OR REPLACE INTO history (role, key, data) VALUES (?, ?, ?)",
+            (role, key, json.dumps(data, ensure_ascii=False, default=_to_json)),
+        )
+
+    def delete(self, role, key):
+        self._db.execute("DELETE FROM history WHERE role = ? AND key = ?", (role, key))
+
+    def clear(self, roles=ROLES):
+        self._db.executemany("DELETE FROM history WHERE role = ?", [(r,) for r in roles])
+
+    def maybe_compact(self, player, enemy):
+        pass
+
+    def compact(self, player, enemy, background=False):
+        rows = [(role, k, json.dumps(v, ensure_ascii=False, default=_to_json))
+                for role, d in (("player", player), ("enemy", enemy)) for k, v in d.items()]
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.execute("DELETE FROM history")
+            self._db.executemany("INSERT INTO history (role, key, data) VALUES (?, ?, ?)", rows)
+
+    def wait(self):
+        pass
+
+    def close(self):
+        self._db.close()
+
+
+def open_history_store(snapshot_path, backend="journal"):
+    if backend == "sqlite":
+        db_path = os.path.splitext(snapshot_path)[0] + ".sqlite3"
+        is_new = not os.path.exists(db_path)
+        store = SqliteHistoryStore(db_path)
+        if is_new:
+            # First switch to SQLite: carry over the JSON history and journal.
+            store.compact(*JournalHistoryStore(snapshot_path).load())
+        return store
+    return JournalHistoryStore(snapshot_path)
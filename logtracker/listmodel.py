@@ -0,0 +1,63 @@
+import bisect
+
+
+class ListModel:
+    # Sorted rows of the Pokemon list: (section, lowercase name, key), with key
+    # "" marking a section header. Rows are unique, so bisect finds any row.
+    # insert and delete return the position that changed (None if nothing
+    # did), which is all a listbox showing the rows needs to follow along.
+    def __init__(self, roles, pinned=()):
+        self.roles = tuple(roles)
+        self.order = {role: i for i, role in enumerate(self.roles)}
+        self.pinned = set(pinned)   # sections shown even when empty
+        self.rows = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        return self.rows[i]
+
+    def row(self, role, key, data):
+        return (self.order[role], str(data.get("NAME", "")).lower(), key)
+
+    def header(self, role):
+        return (self.order[role], "", "")
+
+    def role_of(self, row):
+        return self.roles[row[0]]
+
+    def position(self, row):
+        # Where row is, or would go.
+        return bisect.bisect_left(self.rows, row)
+
+    def index(self, row):
+        i = bisect.bisect_left(self.rows, row)
+        if i < len(self.rows) and self.rows[i] == row:
+            return i
+        return None
+
+    def insert(self, row):
+        i = bisect.bisect_left(self.rows, row)
+        if i < len(self.rows) and self.rows[i] == row:
+            return None
+        self.rows.insert(i, row)
+        return i
+
+    def delete(self, row):
+        i = self.index(row)
+        if i is not None:
+            del self.rows[i]
+        return i
+
+    def rebuild(self, sources):
+        # sources: {role: {key: record}}
+        rows = []
+        for role in self.roles:
+            data = sources.get(role) or {}
+            if data or role in self.pinned:
+                rows.append(self.header(role))
+                rows.extend(self.row(role, k, v) for k, v in data.items())
+        rows.sort()
+        self.rows = rows
+        return rows
@@ -0,0 +1,224 @@
+import hashlib
+import os
+import pickle
+import time
+
+from . import perf
+from .parser import parse_log_sections, parse_pokemon_data, read_log_section, stream_log
+from .sections import LOG_SECTION_PARSERS
+
+LOG_CACHE_DIR = "log_cache"
+LOG_CACHE_VERSION = 3
+
+log_cache_stats = {"hits": 0, "misses": 0, "last_ms": 0.0, "last_hit": False}
+
+
+class PokemonLog:
+    # One loaded log: the stats table plus the spans of its other sections,
+    # which are parsed the first time they are asked for.
+    def __init__(self, path=None, data=None, sections=None, signature=None):
+        self.path = path
+        self.data = data if data is not None else {}
+        self.sections = sections if sections is not None else {}
+        self.signature = signature   # (size, mtime_ns, digest) of the file as loaded
+        self._section_cache = {}
+        self._stat_table = None
+
+    def __len__(self):
+        return len(self.data)
+
+    def extend(self, rows):
+        # Rows arriving from a streaming load; derived tables are rebuilt on
+        # next use.
+        self.data.update(rows)
+        self._stat_table = None
+
+    def set_sections(self, sections, signature=None):
+        # A streamed load fills in the sections, and the signature of the file
+        # it read, once it reaches the end.
+        self.sections = sections
+        self._section_cache = {}
+        if signature is not None:
+            self.signature = signature
+
+    def apply_update(self, data, sections, signature):
+        # A fresh parse of the same file, applied in place: self.data keeps its
+        # identity and unchanged species keep their record objects. Returns
+        # {"added": {key: new}, "removed": {key: old}, "changed": {key: (old, new)}}.
+        old = self.data
+        changes = {"added": {}, "removed": {}, "changed": {}}
+        for k, rec in data.items():
+            prev = old.get(k)
+            if prev is None:
+                changes["added"][k] = rec
+            elif prev != rec:
+                changes["changed"][k] = (prev, rec)
+        for k, rec in old.items():
+            if k not in data:
+                changes["removed"][k] = rec
+        for k in changes["removed"]:
+            del old[k]
+        old.update(changes["added"])
+        old.update((k, new) for k, (_, new) in changes["changed"].items())
+        self.set_sections(sections, signature)
+        self._stat_table = None
+        return changes
+
+    def section(self, kind):
+        if kind in self._section_cache:
+            return self._section_cache[kind]
+        matches, parser = LOG_SECTION_PARSERS[kind]
+        result = None
+        for title, span in self.sections.items():
+            if matches(title.upper()):
+                try:
+                    result = parser(read_log_section(self.path, span))
+                except Exception:
+                    result = None
+                break
+        self._section_cache[kind] = result
+        return result
+
+    def stat_table(self):
+        # numpy is only imported once something actually needs the table.
+        if self._stat_table is None:
+            from .analytics import StatTable
+            self._stat_table = StatTable(self.data)
+        return self._stat_table
+
+    def percentiles(self, record):
+        # Percentiles are relative to this log, also for history entries that
+        # came from an earlier seed.
+        if not self.data:
+            return None
+        return self.stat_table().percentiles(record)
+
+
+def _log_cache_path(file_path):
+    key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+    return os.path.join(LOG_CACHE_DIR, key + ".bin")
+
+
+def file_digest(file_path):
+    h = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_signature(file_path):
+    st = os.stat(file_path)
+    return st.st_size, st.st_mtime_ns
+
+
+def reread_log(log):
+    # Worker-safe check of a loaded log against its file. Returns (signature,
+    # None) if only the timestamp moved, else (signature, (data, sections))
+    # with just the stats table parsed; apply it with log.apply_update.
+    size, mtime = file_signature(log.path)
+    digest = file_digest(log.path)
+    if log.signature is not None and log.signature[2] == digest:
+        return (size, mtime, digest), None
+    with perf.span("log.reparse"):
+        data = parse_pokemon_data(log.path)
+        sections = parse_log_sections(log.path)
+    return (size, mtime, digest), (data, sections)
+
+
+def _read_log_cache(file_path, st):
+    # Header and table are pickled back to back so a stale entry is rejected
+    # before the table is deserialized. Size+mtime is the fast check; only if
+    # the mtime moved is the file re-hashed to see whether it really changed.
+    cache_path = _log_cache_path(file_path)
+    try:
+        with open(cache_path, "rb") as f:
+            header = pickle.load(f)
+            if (header.get("version") != LOG_CACHE_VERSION
+                    or header.get("path") != os.path.abspath(file_path)
+                    or header.get("size") != st.st_size):
+                return None
+            if header.get("mtime") != st.st_mtime_ns:
+                if header.get("digest") != file_digest(file_path):
+                    return None
+                header["mtime"] = st.st_mtime_ns
+                data = pickle.load(f)
+                _write_log_cache(file_path, header, data)
+                return header, data
+            return header, pickle.load(f)
+    except Exception:
+        return None
+
+
+def _write_log_cache(file_path, header, data):
+    cache_path = _log_cache_path(file_path)
+    try:
+        os.makedirs(LOG_CACHE_DIR, exist_ok=True)
+        tmp = cache_path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+    except Exception:
+        pass
+
+
+@perf.timed("log.load")
+def load_log(file_path, use_cache=True, on_rows=None, cancel=None, batch_size=500):
+    # With on_rows, the records are also handed over in batches as
+    # on_rows(rows, bytes_done, bytes_total) while the file is read; setting
+    # the cancel Event stops the load and returns None.
+    t0 = time.perf_counter()
+    st = os.stat(file_path)
+    cached = _read_log_cache(file_path, st) if use_cache else None
+    hit = cached is not None
+    perf.count("log_cache", hit)
+    digest = None
+    if hit:
+        header, (data, sections) = cached
+        digest = header.get("digest")
+        if on_rows is not None:
+            items = list(data.items())
+            for i in range(0, len(items), batch_size):
+                if cancel is not None and cancel.is_set():
+                    return None
+                on_rows(items[i:i + batch_size], st.st_size * min(i + batch_size, len(items)) // len(items), st.st_size)
+    elif on_rows is not None:
+        data, sections = {}, {}
+        h = hashlib.blake2b(digest_size=20)
+        for rows, done in stream_log(file_path, sections, digest=h):
+            if cancel is not None and cancel.is_set():
+                return None
+            with perf.span("log.parse_chunk"):
+                data.update(rows)
+            on_rows(rows, done, st.st_size)
+        digest = h.hexdigest()
+    else:
+        with perf.span("log.parse"):
+            data = parse_pokemon_data(file_path)
+            sections = parse_log_sections(file_path)
+    if use_cache and not hit:
+        digest = digest or file_digest(file_path)
+        header = {
+            "version": LOG_CACHE_VERSION,
+            "path": os.path.abspath(file_path),
+            "size": st.st_size,
+            "mtime": st.st_mtime_ns,
+            "digest": digest,
+        }
+        _write_log_cache(file_path, header, (data, sections))
+    log_cache_stats["hits" if hit else "misses"] += 1
+    log_cache_stats["last_hit"] = hit
+    log_cache_stats["last_ms"] = (time.perf_counter() - t0) * 1000
+    return PokemonLog(file_path, data, sections, (st.st_size, st.st_mtime_ns, digest))
+
+
+def load_pokemon_data(file_path, use_cache=True):
+    return load_log(file_path, use_cache).data
+
+
+def log_cache_summary():
+    s = log_cache_stats
+    total = s["hits"] + s["misses"]
+    src = "cache" if s["last_hit"] else "parsed"
+    return f"{s['last_ms']:.1f} ms ({src}), log cache hits {s['hits']}/{total}"
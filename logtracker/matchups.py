@@ -0,0 +1,173 @@
+import numpy as np
+
+from .analytics import split_types
+from .records import record_from_dict
+
+TYPES = ("NORMAL", "FIRE", "WATER", "ELECTRIC", "GRASS", "ICE", "FIGHTING", "POISON", "GROUND",
+         "FLYING", "PSYCHIC", "BUG", "ROCK", "GHOST", "DRAGON", "DARK", "STEEL", "FAIRY")
+TYPE_INDEX = {t: i for i, t in enumerate(TYPES)}
+
+# attacker -> (super effective against, not very effective against, no effect on)
+TYPE_EFFECTS = {
+    "NORMAL": ("", "ROCK STEEL", "GHOST"),
+    "FIRE": ("GRASS ICE BUG STEEL", "FIRE WATER ROCK DRAGON", ""),
+    "WATER": ("FIRE GROUND ROCK", "WATER GRASS DRAGON", ""),
+    "ELECTRIC": ("WATER FLYING", "ELECTRIC GRASS DRAGON", "GROUND"),
+    "GRASS": ("WATER GROUND ROCK", "FIRE GRASS POISON FLYING BUG DRAGON STEEL", ""),
+    "ICE": ("GRASS GROUND FLYING DRAGON", "FIRE WATER ICE STEEL", ""),
+    "FIGHTING": ("NORMAL ICE ROCK DARK STEEL", "POISON FLYING PSYCHIC BUG FAIRY", "GHOST"),
+    "POISON": ("GRASS FAIRY", "POISON GROUND ROCK GHOST", "STEEL"),
+    "GROUND": ("FIRE ELECTRIC POISON ROCK STEEL", "GRASS BUG", "FLYING"),
+    "FLYING": ("GRASS FIGHTING BUG", "ELECTRIC ROCK STEEL", ""),
+    "PSYCHIC": ("FIGHTING POISON", "PSYCHIC STEEL", "DARK"),
+    "BUG": ("GRASS PSYCHIC DARK", "FIRE FIGHTING POISON FLYING GHOST STEEL FAIRY", ""),
+    "ROCK": ("FIRE ICE FLYING BUG", "FIGHTING GROUND STEEL", ""),
+    "GHOST": ("PSYCHIC GHOST", "DARK", "NORMAL"),
+    "DRAGON": ("DRAGON", "STEEL", "FAIRY"),
+    "DARK": ("PSYCHIC GHOST", "FIGHTING DARK FAIRY", ""),
+    "STEEL": ("ICE ROCK FAIRY", "FIRE WATER ELECTRIC STEEL", ""),
+    "FAIRY": ("FIGHTING DRAGON DARK", "FIRE POISON STEEL", ""),
+}
+
+
+def _type_chart():
+    chart = np.ones((len(TYPES), len(TYPES)), dtype=np.float32)
+    for attacker, groups in TYPE_EFFECTS.items():
+        for factor, names in zip((2.0, 0.5, 0.0), groups):
+            for defender in names.split():
+                chart[TYPE_INDEX[attacker], TYPE_INDEX[defender]] = factor
+    return chart
+
+
+# Every defending type combination gets a column: the 18 single types, the
+# 153 dual types (order-free, so FIRE/FLYING and FLYING/FIRE are one), and a
+# last "typeless" combination for unknown or missing types.
+TYPE_CHART = _type_chart()
+COMBOS = [(i,) for i in range(len(TYPES))] + [(i, j) for i in range(len(TYPES)) for j in range(i + 1, len(TYPES))] + [()]
+COMBO_INDEX = {c: n for n, c in enumerate(COMBOS)}
+NEUTRAL_COMBO = len(COMBOS) - 1
+
+
+def _combo_tables():
+    # DUAL_CHART[attacking type, combination] is the damage multiplier; the
+    # extra last row is a typeless attacker. MATCHUP[a, b] is how well a
+    # combination fares against another: the log2 multiplier of a's best
+    # same-type attack on b minus that of b's best attack on a. Immunities
+    # count as 1/16.
+    dual = np.ones((len(TYPES) + 1, len(COMBOS)), dtype=np.float32)
+    for n, combo in enumerate(COMBOS):
+        for t in combo:
+            dual[:len(TYPES), n] *= TYPE_CHART[:, t]
+    log_dual = np.log2(np.maximum(dual, 1 / 16))
+    typeless = len(TYPES)
+    attacks = np.array([(c[0], c[-1]) if c else (typeless, typeless) for c in COMBOS])
+    offense = np.maximum(log_dual[attacks[:, 0]], log_dual[attacks[:, 1]])
+    return dual, offense - offense.T
+
+
+DUAL_CHART, MATCHUP = _combo_tables()
+
+
+def combo_index(type_field):
+    known = sorted({TYPE_INDEX[t] for t in split_types(type_field) if t in TYPE_INDEX})[:2]
+    return COMBO_INDEX.get(tuple(known), NEUTRAL_COMBO)
+
+
+def combo_label(n):
+    return "/".join(TYPES[t] for t in COMBOS[n]) or "???"
+
+
+class MatchupModel:
+    # Player team against enemy history, by type. Each side is kept as a count
+    # per type combination, so adding or dropping an entry is O(1) and the
+    # coverage summary works on at most 172 x 172 combinations however long
+    # the histories get. Derived arrays are cached until a side changes.
+    ROLES = ("player", "enemy")
+
+    def __init__(self):
+        self.entries = {role: {} for role in self.ROLES}   # key -> (combo, bst, name)
+        self.counts = {role: np.zeros(len(COMBOS), dtype=np.int64) for role in self.ROLES}
+        self._arrays = {}
+        self._coverage = None
+
+    def set(self, role, key, record):
+        self.discard(role, key)
+        record = record_from_dict(record)
+        c = combo_index(record.get("TYPE", ""))
+        self.entries[role][key] = (c, record.bst, str(record.get("NAME", key)).strip())
+        self.counts[role][c] += 1
+        self._changed(role)
+
+    def discard(self, role, key):
+        entry = self.entries[role].pop(key, None)
+        if entry is not None:
+            self.counts[role][entry[0]] -= 1
+            self._changed(role)
+
+    def reset(self, role, data):
+        self.entries[role] = {}
+        self.counts[role][:] = 0
+        for k, v in data.items():
+            self.set(role, k, v)
+        self._changed(role)
+
+    def _changed(self, role):
+        self._arrays.pop(role, None)
+        self._coverage = None
+
+    def arrays(self, role):
+        # (keys, names, combination per entry, bst per entry)
+        if role not in self._arrays:
+            entries = self.entries[role]
+            keys = list(entries)
+            self._arrays[role] = (
+                keys,
+                [entries[k][2] for k in keys],
+                np.fromiter((entries[k][0] for k in keys), dtype=np.intp, count=len(keys)),
+                np.fromiter((entries[k][1] for k in keys), dtype=np.int64, count=len(keys)),
+            )
+        return self._arrays[role]
+
+    def scores(self):
+        # Every player entry against every enemy entry: (players, enemies).
+        _, _, pc, _ = self.arrays("player")
+        _, _, ec, _ = self.arrays("enemy")
+        return MATCHUP[np.ix_(pc, ec)]
+
+    def answers(self, record, n=3):
+        # The n player entries that handle this record best, by type score and
+        # then BST: [(key, name, score)].
+        keys, names, pc, bst = self.arrays("player")
+        if not keys:
+            return []
+        scores = MATCHUP[pc, combo_index(record_from_dict(record).get("TYPE", ""))]
+        order = np.lexsort((-bst, -scores))[:n]
+        return [(keys[i], names[i], float(scores[i])) for i in order]
+
+    def coverage(self, n=5):
+        if self._coverage is None:
+            self._coverage = self._compute_coverage(n)
+        return self._coverage
+
+    def _compute_coverage(self, n):
+        pc = np.flatnonzero(self.counts["player"])
+        ec = np.flatnonzero(self.counts["enemy"])
+        weights = self.counts["enemy"][ec]
+        summary = {"players": len(self.entries["player"]), "enemies": len(self.entries["enemy"]),
+                   "ahead": 0, "even": 0, "behind": 0, "threats": [], "best": []}
+        if not len(pc) or not len(ec):
+            return summary
+        sub = MATCHUP[np.ix_(pc, ec)]
+        best = sub.max(axis=0)
+        summary["ahead"] = int(weights[best > 0].sum())
+        summary["even"] = int(weights[best == 0].sum())
+        summary["behind"] = int(weights[best < 0].sum())
+        # Enemy typings the team answers worst, then the team typings that
+        # come out ahead against the most enemies.
+        for i in np.lexsort((-weights, best))[:n]:
+            summary["threats"].append((combo_label(ec[i]), int(weights[i]), float(best[i])))
+        wins = (sub > 0).astype(np.int64) @ weights
+        for i in np.argsort(-wins, kind="stable")[:n]:
+            if wins[i]:
+                summary["best"].append((combo_label(pc[i]), int(self.counts["player"][pc[i]]), int(wins[i])))
+        return summary
@@ -0,0 +1,69 @@
+from . import perf
+
+ROLES = ("player", "enemy", "log")
+
+
+def normalize_name(name):
+    return str(name).strip().lower()
+
+
+class NameIndex:
+    # Key or normalised display name -> key, one map per source, searched in
+    # role order so a listbox click or an exact search resolves without
+    # scanning the dicts. Each term keeps every key that carries it, in the
+    # order they were added, so removing one entry falls back to the next one
+    # with the same name instead of losing the name altogether.
+    def __init__(self, roles=ROLES):
+        self.roles = tuple(roles)
+        self._terms = {role: {} for role in self.roles}
+
+    @staticmethod
+    def _terms_of(key, data):
+        terms = [normalize_name(key)]
+        nm = normalize_name(data.get("NAME", ""))
+        if nm and nm != terms[0]:
+            terms.append(nm)
+        return terms
+
+    def add(self, role, key, data):
+        terms = self._terms[role]
+        for term in self._terms_of(key, data):
+            terms.setdefault(term, {})[key] = None
+
+    def remove(self, role, key, data):
+        terms = self._terms[role]
+        for term in self._terms_of(key, data):
+            keys = terms.get(term)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del terms[term]
+
+    def rebuild(self, role, data):
+        self._terms[role] = {}
+        for k, v in data.items():
+            self.add(role, k, v)
+
+    def update(self, role, changes):
+        # changes as returned by PokemonLog.apply_update.
+        for k, rec in changes["removed"].items():
+            self.remove(role, k, rec)
+        for k, (old, new) in changes["changed"].items():
+            self.remove(role, k, old)
+            self.add(role, k, new)
+        for k, rec in changes["added"].items():
+            self.add(role, k, rec)
+
+    @perf.timed("lookup")
+    def lookup(self, name):
+        # (role, key) of the first source that knows the name, or (None, None).
+        # Within a source an entry whose key is the name wins over one that
+        # only displays it.
+        dn = normalize_name(name)
+        for role in self.roles:
+            keys = self._terms[role].get(dn)
+            if keys:
+                if dn in keys:
+                    return role, dn
+                return role, next(iter(keys))
+        return None, None
@@ -0,0 +1,143 @@
+import mmap
+import os
+import re
+
+from .records import make_record
+
+
+# The base-stats table starts at its NUM|NAME header and runs until the next
+# "--Section--" line of a full Universal Pokemon Randomizer log (or EOF).
+STATS_HEADER_RE = re.compile(rb"(?im)^(?:\xef\xbb\xbf)?[ \t]*NUM\|NAME[^\r\n]*")
+SECTION_START_RE = re.compile(rb"(?m)^[ \t]*--")
+SECTION_TITLE_RE = re.compile(rb"(?m)^[ \t]*--(.*?)--[ \t]*\r?$")
+
+
+def scan_log_sections(mm):
+    sections = {}
+    matches = list(SECTION_TITLE_RE.finditer(mm))
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(mm)
+        title = m.group(1).decode("utf-8", "replace").strip()
+        sections.setdefault(title, (m.end(), end))
+    return sections
+
+
+def find_stats_section(mm, start=0):
+    m = STATS_HEADER_RE.search(mm, start)
+    if not m:
+        return None
+    end = SECTION_START_RE.search(mm, m.end())
+    return m.start(), m.end(), end.start() if end else len(mm)
+
+
+def stats_row_reader(header_line):
+    # Returns a function turning one table line into (key, record), or None
+    # for blank and malformed lines.
+    headers = [h.strip().upper() for h in header_line.lstrip("\ufeff").split("|")]
+    name_pos = headers.index("NAME") if "NAME" in headers else None
+
+    def read(raw):
+        line = raw.strip()
+        if not line or name_pos is None:
+            return None
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) != len(headers):
+            return None
+        name_key = parts[name_pos].lower()
+        if not name_key:
+            return None
+        return name_key, make_record(headers, parts)
+
+    return read
+
+
+def iter_stats_rows(header_line, body):
+    read = stats_row_reader(header_line)
+    for raw in body.splitlines():
+        row = read(raw)
+        if row is not None:
+            yield row
+
+
+def iter_pokemon_records(file_path):
+    # Only the stats table is decoded; the rest of the log is never copied out
+    # of the mapping.
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            section = find_stats_section(mm)
+            if section is None:
+                return
+            start, header_end, end = section
+            header_line = mm[start:header_end].decode("utf-8")
+            body = mm[header_end:end].decode("utf-8")
+    yield from iter_stats_rows(header_line, body)
+
+
+def parse_pokemon_data(file_path):
+    return dict(iter_pokemon_records(file_path))
+
+
+def parse_log_sections(file_path):
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return scan_log_sections(mm)
+
+
+def stream_log(file_path, sections, chunk_size=1 << 16, digest=None):
+    # Reads the log front to back and yields (rows, bytes_read) once per
+    # chunk, rows being the stats-table records completed so far. Section
+    # spans are stored into `sections` along the way, and `digest` (a hashlib
+    # object) sees every byte, so nothing has to read the file a second time.
+    # Gives the same result as parse_pokemon_data plus parse_log_sections.
+    read_row = None
+    in_stats = False
+    title = None
+    title_end = 0
+    pos = 0
+    rest = b""
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if digest is not None:
+                digest.update(chunk)
+            lines = (rest + chunk).split(b"\n")
+            rest = lines.pop() if chunk else b""
+            rows = []
+            for line in lines:
+                start = pos
+                pos += len(line) + 1
+                if SECTION_START_RE.match(line):
+                    in_stats = False
+                    m = SECTION_TITLE_RE.match(line)
+                    if m:
+                        if title is not None:
+                            sections.setdefault(title, (title_end, start))
+                        title = m.group(1).decode("utf-8", "replace").strip()
+                        title_end = start + m.end()
+                        continue
+                if in_stats:
+                    row = read_row(line.decode("utf-8"))
+                    if row is not None:
+                        rows.append(row)
+                elif read_row is None:
+                    m = STATS_HEADER_RE.match(line)
+                    if m:
+                        read_row = stats_row_reader(m.group(0).decode("utf-8"))
+                        in_stats = True
+            if not chunk:
+                break
+            yield rows, pos + len(rest)
+    if title is not None:
+        sections.setdefault(title, (title_end, pos - 1))
+    if rows:
+        yield rows, pos - 1
+
+
+def read_log_section(file_path, span):
+    with open(file_path, "rb") as f:
+        f.seek(span[0])
+        return f.read(span[1] - span[0]).decode("utf-8", "replace")
@@ -0,0 +1,202 @@
+# Opt-in timing hooks. While disabled, timed() costs one global check per
+# call and span() hands back a shared no-op context manager. While enabled,
+# every span goes into a per-operation latency histogram and a bounded event
+# buffer that can be exported in Chrome trace format (chrome://tracing,
+# ui.perfetto.dev).
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+
+BUCKETS_PER_OCTAVE = 4
+BUCKET_COUNT = 128
+TRACE_EVENT_LIMIT = 200_000
+
+enabled = False
+
+_lock = threading.Lock()
+_histograms = {}     # name -> Histogram
+_counters = {}       # name -> [hits, misses]
+_events = deque(maxlen=TRACE_EVENT_LIMIT)
+_thread_names = {}
+_t0 = time.perf_counter()
+
+
+class Histogram:
+    # Log-scale buckets (four per doubling, from 1 microsecond), so
+    # percentiles are within about 20% while memory stays constant.
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * BUCKET_COUNT
+
+    def add(self, us):
+        self.count += 1
+        self.total += us
+        self.min = min(self.min, us)
+        self.max = max(self.max, us)
+        i = int(math.log2(us) * BUCKETS_PER_OCTAVE) if us > 1 else 0
+        self.buckets[min(i, BUCKET_COUNT - 1)] += 1
+
+    def percentile(self, p):
+        # Upper edge of the bucket holding the p-th percentile, in microseconds.
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return min(2 ** ((i + 1) / BUCKETS_PER_OCTAVE), self.max)
+        return self.max
+
+
+def enable(on=True):
+    global enabled
+    enabled = bool(on)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _events.clear()
+
+
+def record(name, start, end, args=None):
+    # start/end are time.perf_counter() values.
+    us = (end - start) * 1e6
+    tid = threading.get_ident()
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.add(us)
+        if tid not in _thread_names:
+            _thread_names[tid] = threading.current_thread().name
+        _events.append((name, (start - _t0) * 1e6, us, tid, args))
+
+
+def count(name, hit):
+    # Cache hit/miss tally; a no-op while disabled.
+    if not enabled:
+        return
+    with _lock:
+        c = _counters.get(name)
+        if c is None:
+            c = _counters[name] = [0, 0]
+        c[0 if hit else 1] += 1
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, **args):
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name, args or None)
+
+
+def timed(name):
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*a, **k):
+            if not enabled:
+                return fn(*a, **k)
+            start = time.perf_counter()
+            try:
+                return fn(*a, **k)
+            finally:
+                record(name, start, time.perf_counter())
+        return inner
+    return wrap
+
+
+def summary():
+    # [(name, count, p50_ms, p95_ms, max_ms, total_ms)] sorted by total time.
+    with _lock:
+        rows = [(name, h.count, h.percentile(50) / 1000, h.percentile(95) / 1000, h.max / 1000, h.total / 1000)
+                for name, h in _histograms.items()]
+    return sorted(rows, key=lambda r: -r[5])
+
+
+def hit_ratios():
+    # [(name, hits, misses, ratio)]
+    with _lock:
+        items = sorted(_counters.items())
+    return [(name, h, m, h / (h + m) if h + m else 0.0) for name, (h, m) in items]
+
+
+def format_summary():
+    lines = [f"{'operation':<24}{'n':>7}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+    for name, n, p50, p95, mx, _ in summary():
+        lines.append(f"{name:<24}{n:>7}{p50:>10.2f}{p95:>10.2f}{mx:>10.2f}")
+    ratios = hit_ratios()
+    if ratios:
+        lines.append("")
+        lines.append(f"{'cache':<24}{'hits':>7}{'misses':>10}{'ratio':>10}")
+        for name, h, m, r in ratios:
+            lines.append(f"{name:<24}{h:>7}{m:>10}{r:>10.1%}")
+    return "\n".join(lines) + "\n"
+
+
+def chrome_trace():
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        threads = dict(_thread_names)
+    trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+             for tid, name in threads.items()]
+    for name, ts, dur, tid, args in events:
+        ev = {"name": name, "cat": name.split(".", 1)[0], "ph": "X", "ts": round(ts, 3),
+              "dur": round(dur, 3), "pid": pid, "tid": tid}
+        if args:
+            ev["args"] = {k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in args.items()}
+        trace.append(ev)
+    return {
+        "traceEvents": trace,
+        "displayTimeUnit": "ms",
+        "otherData": {
+            "summary": [dict(zip(("name", "count", "p50_ms", "p95_ms", "max_ms", "total_ms"), r)) for r in summary()],
+            "hit_ratios": [dict(zip(("name", "hits", "misses", "ratio"), r)) for r in hit_ratios()],
+        },
+    }
+
+
+def export_chrome_trace(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(chrome_trace(), f)
+    return path
@@ -0,0 +1,119 @@
+import sys
+from collections.abc import Mapping
+
+BASE_KEYS = ("TYPE", "NUM", "HP", "ATK", "DEF", "SPE", "SATK", "SDEF")
+STAT_KEYS = ("HP", "ATK", "DEF", "SPE", "SATK", "SDEF")
+STAT_COLUMNS = STAT_KEYS + ("BST",)
+# Universal Pokemon Randomizer logs call speed SPD; older exports used SPE.
+STAT_ALIASES = {"SPE": ("SPE", "SPD")}
+
+_layouts = {}
+
+
+def stat_column(stat):
+    # The STAT_COLUMNS name for stat, accepting aliases such as SPD; None if
+    # it is not a stat.
+    name = str(stat).strip().upper()
+    for key, aliases in STAT_ALIASES.items():
+        if name in aliases:
+            return key
+    return name if name in STAT_COLUMNS else None
+
+
+def parse_stat(value):
+    v = value.strip()
+    try:
+        return int(v)
+    except ValueError:
+        return 0
+
+
+class Layout:
+    # Column names of one stats table, shared by every record parsed from it.
+    __slots__ = ("names", "index", "stat_pos")
+
+    def __init__(self, names):
+        self.names = names
+        self.index = {n: i for i, n in enumerate(names)}
+        self.stat_pos = tuple(
+            next((self.index[a] for a in STAT_ALIASES.get(k, (k,)) if a in self.index), None)
+            for k in STAT_KEYS
+        )
+
+    def __reduce__(self):
+        return (layout_for, (self.names,))
+
+
+def layout_for(names):
+    names = tuple(sys.intern(n) for n in names)
+    layout = _layouts.get(names)
+    if layout is None:
+        layout = _layouts[names] = Layout(names)
+    return layout
+
+
+class PokemonRecord(Mapping):
+    # Read-only row of a stats table. Behaves like the dict of strings it
+    # replaces, but stats are parsed once and the values are interned.
+    __slots__ = ("layout", "values", "stats", "bst")
+
+    def __init__(self, layout, values):
+        self.layout = layout
+        self.values = tuple(sys.intern(v) for v in values)
+        self.stats = tuple(0 if i is None else parse_stat(self.values[i]) for i in layout.stat_pos)
+        self.bst = sum(self.stats)
+
+    def __reduce__(self):
+        return (PokemonRecord, (self.layout, self.values))
+
+    def __getitem__(self, key):
+        return self.values[self.layout.index[key]]
+
+    def __contains__(self, key):
+        return key in self.layout.index
+
+    def __iter__(self):
+        return iter(self.layout.names)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __eq__(self, other):
+        if isinstance(other, PokemonRecord):
+            return self.values == other.values and self.layout.names == other.layout.names
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        return hash((self.layout.names, self.values))
+
+    def __repr__(self):
+        return f"PokemonRecord({self.to_dict()!r})"
+
+    def copy(self):
+        # Records are immutable, so history entries can share them.
+        return self
+
+    def to_dict(self):
+        return dict(zip(self.layout.names, self.values))
+
+
+def make_record(headers, values):
+    # Base columns missing from the table are filled with "" as before.
+    missing = [k for k in BASE_KEYS if not any(a in headers for a in STAT_ALIASES.get(k, (k,)))]
+    if missing:
+        headers = list(headers) + missing
+        values = list(values) + [""] * len(missing)
+    return PokemonRecord(layout_for(headers), values)
+
+
+def record_from_dict(data):
+    if isinstance(data, PokemonRecord):
+        return data
+    items = [(str(k), str(v)) for k, v in data.items()]
+    # History saved by older versions has every base key filled in, so a
+    # blank SPE sits next to the real SPD and would be read as speed 0.
+    filled = {k for k, v in items if v.strip()}
+    for aliases in STAT_ALIASES.values():
+        if any(a in filled for a in aliases):
+            items = [(k, v) for k, v in items if k in filled or k not in aliases]
+    return make_record([k for k, _ in items], [v for _, v in items])
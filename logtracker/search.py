@@ -0,0 +1,282 @@
+# Search index over species names, types and abilities. Kept free of Tk so it
+# can be driven and benchmarked headlessly.
+import heapq
+from collections import Counter
+from itertools import chain
+
+TIER_EXACT = 0
+TIER_PREFIX = 1
+TIER_SUBSTRING = 2
+TIER_ATTRIBUTE = 3
+TIER_FUZZY = 4
+
+# Most terms the fuzzy tier runs edit distance on; the ones sharing the most
+# trigrams with the query go first.
+FUZZY_CANDIDATES = 128
+
+
+def normalize(text):
+    return " ".join(str(text).lower().split())
+
+
+def trigrams(term):
+    # Unpadded: edge grams like "  b" or " bu" are shared by a large share of
+    # all names and filter nothing.
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+def edit_distance(a, b, limit):
+    # Damerau-Levenshtein (optimal string alignment), anything over limit
+    # coming back as limit + 1. A shared prefix and suffix cost nothing and
+    # are skipped, and only cells within limit of the diagonal can stay under
+    # it, so the rest of each row is never computed.
+    over = limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return over
+    n = min(len(a), len(b))
+    start = 0
+    while start < n and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < n - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a = a[start:len(a) - end]
+    b = b[start:len(b) - end]
+    if not a or not b:
+        return min(len(a) + len(b), over)
+    prev2 = None
+    prev = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        cur = [over] * (len(b) + 1)
+        if i <= limit:
+            cur[0] = i
+        best = cur[0]
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cb = b[j - 1]
+            d = prev[j - 1] if ca == cb else prev[j - 1] + 1
+            if prev[j] + 1 < d:
+                d = prev[j] + 1
+            if cur[j - 1] + 1 < d:
+                d = cur[j - 1] + 1
+            if prev2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb and prev2[j - 2] + 1 < d:
+                d = prev2[j - 2] + 1
+            cur[j] = d
+            if d < best:
+                best = d
+        if best > limit:
+            return over
+        prev2, prev = prev, cur
+    return min(prev[-1], over)
+
+
+class _Trie:
+    # Character trie; walking a prefix and then its subtree in sorted order
+    # yields matching terms alphabetically, so a short prefix can stop after
+    # `limit` terms instead of touching every entry.
+    def __init__(self):
+        self.root = {}
+
+    def add(self, term):
+        node = self.root
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def discard(self, term):
+        node = self.root
+        for ch in term:
+            node = node.get(ch)
+            if node is None:
+                return
+        node.pop("", None)
+
+    def iter_prefix(self, prefix):
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return
+        stack = [(prefix, node)]
+        while stack:
+            term, node = stack.pop()
+            if "" in node:
+                yield term
+            for ch in sorted((c for c in node if c), reverse=True):
+                stack.append((term + ch, node[ch]))
+
+
+class _Field:
+    def __init__(self):
+        self.trie = _Trie()
+        self.docs = {}       # term -> set of doc ids
+        self.grams = {}      # trigram -> {term length: set of terms}
+        self._sorted = {}    # term -> sorted doc ids, rebuilt lazily
+
+    def sorted_docs(self, term):
+        docs = self._sorted.get(term)
+        if docs is None:
+            docs = self._sorted[term] = sorted(self.docs.get(term, ()))
+        return docs
+
+    def add(self, term, doc_id):
+        self._sorted.pop(term, None)
+        docs = self.docs.get(term)
+        if docs is None:
+            docs = self.docs[term] = set()
+            self.trie.add(term)
+            for g in trigrams(term):
+                self.grams.setdefault(g, {}).setdefault(len(term), set()).add(term)
+        docs.add(doc_id)
+
+    def discard(self, term, doc_id):
+        docs = self.docs.get(term)
+        if docs is None:
+            return
+        self._sorted.pop(term, None)
+        docs.discard(doc_id)
+        if not docs:
+            del self.docs[term]
+            self.trie.discard(term)
+            for g in trigrams(term):
+                buckets = self.grams.get(g)
+                terms = buckets.get(len(term)) if buckets is not None else None
+                if terms is not None:
+                    terms.discard(term)
+                    if not terms:
+                        del buckets[len(term)]
+                        if not buckets:
+                            del self.grams[g]
+
+    def containing(self, text):
+        # Terms with text in them, checked only against the terms of text's
+        # rarest trigram. text needs at least three characters.
+        rarest = None
+        for g in trigrams(text):
+            buckets = self.grams.get(g)
+            if buckets is None:
+                return []
+            size = sum(len(terms) for terms in buckets.values())
+            if rarest is None or size < rarest[0]:
+                rarest = (size, buckets)
+        if rarest is None:
+            return []
+        return [t for n, terms in rarest[1].items() if n >= len(text) for t in terms if text in t]
+
+    def candidates(self, query_grams, min_shared, lengths=None, cap=None):
+        # Terms sharing at least min_shared of query_grams, counting only the
+        # length buckets in lengths (all if None). With cap, only the cap terms
+        # sharing the most are kept.
+        groups = []
+        for g in query_grams:
+            buckets = self.grams.get(g)
+            if buckets is None:
+                continue
+            if lengths is None:
+                groups.extend(buckets.values())
+            else:
+                groups.extend(buckets[n] for n in lengths if n in buckets)
+        counts = Counter(chain.from_iterable(groups))
+        if cap is not None and len(counts) > cap:
+            # Raise min_shared to the lowest count that still keeps at most
+            # cap terms, so ties at the cut are all in or all out.
+            kept = 0
+            for shared, n in sorted(Counter(counts.values()).items(), reverse=True):
+                if shared < min_shared:
+                    break
+                if kept + n > cap:
+                    if not kept:
+                        return heapq.nsmallest(cap, (t for t, m in counts.items() if m == shared))
+                    min_shared = shared + 1
+                    break
+                kept += n
+        return [t for t, n in counts.items() if n >= min_shared]
+
+
+class SearchIndex:
+    def __init__(self):
+        self._names = _Field()
+        self._attrs = _Field()
+        self._doc_terms = {}
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._doc_terms
+
+    def clear(self):
+        self.__init__()
+
+    def add(self, doc_id, name, types=(), abilities=()):
+        self.remove(doc_id)
+        names = {normalize(name), normalize(doc_id)} - {""}
+        words = {w for n in names for w in n.split() if w not in names}
+        attrs = {normalize(a) for a in (*types, *abilities)} - {""}
+        for term in names | words:
+            self._names.add(term, doc_id)
+        for term in attrs:
+            self._attrs.add(term, doc_id)
+        self._doc_terms[doc_id] = (names | words, attrs)
+
+    def add_record(self, doc_id, data):
+        types = str(data.get("TYPE", "")).split("/")
+        abilities = [data.get(k, "") for k in ("ABILITY1", "ABILITY2", "ABILITY3")]
+        self.add(doc_id, data.get("NAME", doc_id), types, abilities)
+
+    def remove(self, doc_id):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms[0]:
+            self._names.discard(term, doc_id)
+        for term in terms[1]:
+            self._attrs.discard(term, doc_id)
+
+    def query(self, text, limit=20):
+        # Returns [(doc_id, tier), ...] best first; lower tiers rank higher and
+        # fuzzy hits are ordered by edit distance.
+        q = normalize(text)
+        if not q or limit <= 0:
+            return []
+        out = {}
+
+        def take(field, term, tier, rank=0):
+            for doc_id in field.sorted_docs(term):
+                if len(out) >= limit and tier != TIER_FUZZY:
+                    return
+                if doc_id not in out:
+                    out[doc_id] = (tier, rank)
+
+        take(self._names, q, TIER_EXACT)
+        for term in self._names.trie.iter_prefix(q):
+            if len(out) >= limit:
+                break
+            take(self._names, term, TIER_PREFIX)
+
+        q_grams = trigrams(q)
+        if len(q) >= 3 and len(out) < limit:
+            for term in sorted(self._names.containing(q)):
+                if len(out) >= limit:
+                    break
+                take(self._names, term, TIER_SUBSTRING)
+
+        if len(out) < limit:
+            for term in self._attrs.trie.iter_prefix(q):
+                if len(out) >= limit:
+                    break
+                take(self._attrs, term, TIER_ATTRIBUTE)
+
+        if len(q) >= 4 and len(out) < limit:
+            max_dist = 1 if len(q) <= 6 else 2
+            # Each edit shifts the length by at most one and destroys at most
+            # four of the query's trigrams (a transposition; other edits three).
+            lengths = range(len(q) - max_dist, len(q) + max_dist + 1)
+            min_shared = max(1, len(q_grams) - 4 * max_dist)
+            for term in self._names.candidates(q_grams, min_shared, lengths, FUZZY_CANDIDATES):
+                d = edit_distance(q, term, max_dist)
+                if d <= max_dist:
+                    take(self._names, term, TIER_FUZZY, d)
+
+        ranked = sorted(out.items(), key=lambda item: (item[1], item[0]))
+        return [(doc_id, tier) for doc_id, (tier, _) in ranked[:limit]]
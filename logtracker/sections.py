@@ -0,0 +1,99 @@
+import re
+
+
+EVOLUTION_RE = re.compile(r"^(.+?)\s*->\s*(.+)$")
+MOVESET_HEADER_RE = re.compile(r"^\d+\s+(.+?)(?:\s*->\s*(.*))?$")
+LEVEL_MOVE_RE = re.compile(r"Level\s+(\d+)\s*:\s*([^,]+)")
+TRAINER_RE = re.compile(r"^#(\d+)\s*\((.*?)\)\s*-\s*(.*)$")
+TEAM_MEMBER_RE = re.compile(r"^(.+?)\s+Lv\s*(\d+)(?:\s*@\s*(.+))?$")
+WILD_SET_RE = re.compile(r"^Set\s*#(\d+)\s*-\s*(.*?)(?:\s*\(rate=\d+\))?(?:\s+-\s+(.*))?$")
+WILD_SLOT_RE = re.compile(r"^(.+?)\s+Lv\s*(\d+)(?:\s*-\s*(\d+))?")
+
+
+def parse_evolutions(text):
+    evolves_to, evolves_from = {}, {}
+    for raw in text.splitlines():
+        m = EVOLUTION_RE.match(raw.strip())
+        if not m:
+            continue
+        src = m.group(1).strip()
+        for dst in re.split(r",|\band\b", m.group(2)):
+            dst = dst.strip()
+            if dst:
+                evolves_to.setdefault(src.lower(), []).append(dst)
+                evolves_from.setdefault(dst.lower(), []).append(src)
+    return {"to": evolves_to, "from": evolves_from}
+
+
+def parse_movesets(text):
+    moves = {}
+    current = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        m = MOVESET_HEADER_RE.match(line)
+        if m:
+            current = moves.setdefault(m.group(1).strip().lower(), [])
+            # Older logs put the whole learnset on the header line.
+            for lvl, move in LEVEL_MOVE_RE.findall(m.group(2) or ""):
+                current.append((int(lvl), move.strip()))
+            continue
+        if current is not None and line.startswith("Level"):
+            for lvl, move in LEVEL_MOVE_RE.findall(line):
+                current.append((int(lvl), move.strip()))
+    return moves
+
+
+def parse_trainers(text):
+    trainers = {}
+    by_species = {}
+    for raw in text.splitlines():
+        m = TRAINER_RE.match(raw.strip())
+        if not m:
+            continue
+        team = []
+        for member in m.group(3).split(","):
+            mem = TEAM_MEMBER_RE.match(member.strip())
+            if not mem:
+                continue
+            species = mem.group(1).strip()
+            team.append((species, int(mem.group(2)), (mem.group(3) or "").strip()))
+            by_species.setdefault(species.lower(), []).append(m.group(1))
+        trainers[m.group(1)] = {"name": m.group(2).strip(), "team": team}
+    return {"trainers": trainers, "by_species": by_species}
+
+
+def parse_wild(text):
+    by_species = {}
+    area = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        m = WILD_SET_RE.match(line)
+        if m:
+            area = m.group(2).strip()
+            slots = m.group(3).split(",") if m.group(3) else []
+        elif area is not None:
+            slots = [line]
+        else:
+            continue
+        for slot in slots:
+            s = WILD_SLOT_RE.match(slot.strip())
+            if not s:
+                continue
+            lo = int(s.group(2))
+            hi = int(s.group(3)) if s.group(3) else lo
+            entry = by_species.setdefault(s.group(1).strip().lower(), {})
+            prev = entry.get(area)
+            entry[area] = (min(lo, prev[0]), max(hi, prev[1])) if prev else (lo, hi)
+    return by_species
+
+
+LOG_SECTION_PARSERS = {
+    "evolutions": (lambda t: "EVOLUTION" in t, parse_evolutions),
+    "movesets": (lambda t: "MOVESET" in t, parse_movesets),
+    "trainers": (lambda t: "TRAINER" in t and "POKEMON" in t, parse_trainers),
+    "wild": (lambda t: "WILD" in t and "POKEMON" in t, parse_wild),
+}
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from . import perf
+
+SPRITE_BASE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon"
+SPRITE_VARIANTS = {
+    "front": "{dex}.png",
+    "shiny": "shiny/{dex}.png",
+    "back": "back/{dex}.png",
+    "animated": "versions/generation-v/black-white/animated/{dex}.gif",
+}
+ANIMATED_VARIANTS = frozenset({"animated"})
+
+
+def sprite_url(dex_num, variant="front", base_url=None):
+    return f"{base_url or SPRITE_BASE_URL}/{SPRITE_VARIANTS[variant].format(dex=dex_num)}"
+
+
+def dex_numbers_of(data):
+    out = set()
+    for row in data.values():
+        num = str(row.get("NUM", "")).strip()
+        if num.isdigit():
+            out.add(int(num))
+    return out
+
+
+class SpriteStore:
+    # Downloaded sprite files, content-addressed on disk under cache_dir with
+    # a JSON index in LRU order, plus the pooled HTTP session that fills it.
+    # Identical images (e.g. shared placeholders) are stored once and
+    # refcounted. All public methods are thread-safe.
+    def __init__(self, cache_dir="sprite_cache", max_bytes=32 * 1024 * 1024, base_url=None,
+                 workers=16, retries=3, backoff=0.3):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.max_bytes = max_bytes
+        self.base_url = base_url
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.index = OrderedDict()   # "dex:variant" -> {"sha", "size"}
+        self.refs = {}               # sha -> number of index entries using it
+        self.bytes = 0
+        self.dirty = False
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "corrupt": 0}
+        self.lock = threading.Lock()
+        self._session = None
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def _blob_path(self, sha):
+        return os.path.join(self.cache_dir, sha[:2], sha + ".png")
+
+    def load_index(self):
+        with self.lock:
+            self.index.clear()
+            self.refs.clear()
+            self.bytes = 0
+            if not os.path.exists(self.index_path):
+                return
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for key, sha, size in data.get("entries", []):
+                    self.index[key] = {"sha": sha, "size": size}
+                    if sha not in self.refs:
+                        self.bytes += size
+                    self.refs[sha] = self.refs.get(sha, 0) + 1
+            except Exception:
+                self.index.clear()
+                self.refs.clear()
+                self.bytes = 0
+            self._evict()
+
+    def save_index(self):
+        with self.lock:
+            self._save_index()
+
+    def _save_index(self):
+        if not self.dirty:
+            return
+        data = {"entries": [[k, e["sha"], e["size"]] for k, e in self.index.items()]}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.index_path)
+            self.dirty = False
+        except Exception:
+            pass
+
+    def _drop(self, key):
+        entry = self.index.pop(key, None)
+        if entry is None:
+            return
+        self.dirty = True
+        self.refs[entry["sha"]] -= 1
+        if self.refs[entry["sha"]] > 0:
+            return
+        del self.refs[entry["sha"]]
+        self.bytes -= entry["size"]
+        try:
+            os.remove(self._blob_path(entry["sha"]))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self.index and self.bytes > self.max_bytes:
+            self._drop(next(iter(self.index)))
+            self.stats["evictions"] += 1
+
+    def get(self, dex_num, variant="front"):
+        with self.lock:
+            key = f"{dex_num}:{variant}"
+            entry = self.index.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                perf.count("sprite.disk_cache", False)
+                return None
+            try:
+                with open(self._blob_path(entry["sha"]), "rb") as f:
+                    blob = f.read()
+            except OSError:
+                blob = None
+            if blob is None or len(blob) != entry["size"] or hashlib.sha256(blob).hexdigest() != entry["sha"]:
+                self.stats["corrupt"] += 1
+                self.stats["misses"] += 1
+                perf.count("sprite.disk_cache", False)
+                self._drop(key)
+                return None
+            self.index.move_to_end(key)
+            self.dirty = True
+            self.stats["hits"] += 1
+            perf.count("sprite.disk_cache", True)
+            return blob
+
+    def put(self, dex_num, variant, blob, persist=True):
+        with self.lock:
+            if len(blob) > self.max_bytes:
+                return
+            key = f"{dex_num}:{variant}"
+            sha = hashlib.sha256(blob).hexdigest()
+            self._drop(key)
+            path = self._blob_path(sha)
+            shared = sha in self.refs
+            try:
+                if not shared or not os.path.exists(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    tmp = path + ".tmp"
+                    with open(tmp, "wb") as f:
+                        f.write(blob)
+                    os.replace(tmp, path)
+            except OSError:
+                return
+            if not shared:
+                self.bytes += len(blob)
+            self.refs[sha] = self.refs.get(sha, 0) + 1
+            self.index[key] = {"sha": sha, "size": len(blob)}
+            self.dirty = True
+            self._evict()
+            if persist:
+                self._save_index()
+
+    def session(self):
+        # One pooled session for every sprite request, so prefetching a whole
+        # dex reuses a handful of keep-alive connections instead of one per
+        # sprite. requests is only imported on first use.
+        with self.lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                retry = Retry(total=self.retries, backoff_factor=self.backoff,
+                              status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    @perf.timed("sprite.fetch")
+    def fetch(self, dex_num, variant="front", persist=True):
+        blob = self.get(dex_num, variant)
+        if blob is not None:
+            return blob
+        with perf.span("sprite.download", dex=dex_num):
+            r = self.session().get(sprite_url(dex_num, variant, self.base_url), timeout=10)
+        r.raise_for_status()
+        self.put(dex_num, variant, r.content, persist=persist)
+        return r.content
+
+    def prefetch(self, dex_numbers, variant="front", workers=None, progress=None, cancel=None):
+        with self.lock:
+            missing = sorted({d for d in dex_numbers if d > 0 and f"{d}:{variant}" not in self.index})
+        stats = {"done": 0, "total": len(missing), "fetched": 0, "failed": 0}
+
+        def fetch_one(dex_num):
+            if cancel is not None and cancel.is_set():
+                return False
+            self.fetch(dex_num, variant, persist=False)
+            return True
+
+        with ThreadPoolExecutor(max_workers=max(1, workers or self.workers), thread_name_prefix="prefetch") as pool:
+            for fut in [pool.submit(fetch_one, d) for d in missing]:
+                try:
+                    if fut.result():
+                        stats["fetched"] += 1
+                except Exception:
+                    stats["failed"] += 1
+                stats["done"] += 1
+                if progress is not None:
+                    progress(stats)
+        self.save_index()
+        return stats
@@ -0,0 +1,86 @@
+import os
+from collections import OrderedDict
+
+from .records import STAT_KEYS
+
+
+class Workspace:
+    # Several parsed logs kept side by side. Records that are identical in
+    # more than one seed are stored once (field strings are already interned
+    # by PokemonRecord), so each extra seed only costs what actually changed.
+    def __init__(self):
+        self.logs = OrderedDict()   # path -> PokemonLog
+        self._pool = {}             # record -> the shared instance
+        self._refs = {}             # record -> number of seeds using it
+        self._diffs = {}
+
+    def __len__(self):
+        return len(self.logs)
+
+    def __contains__(self, path):
+        return path in self.logs
+
+    def get(self, path):
+        return self.logs.get(path)
+
+    def add(self, log):
+        if log.path in self.logs:
+            self.remove(log.path)
+        data = log.data
+        for k, rec in data.items():
+            shared = self._pool.setdefault(rec, rec)
+            self._refs[shared] = self._refs.get(shared, 0) + 1
+            if shared is not rec:
+                data[k] = shared
+        self.logs[log.path] = log
+        return log
+
+    def remove(self, path):
+        log = self.logs.pop(path, None)
+        if log is None:
+            return None
+        for rec in log.data.values():
+            n = self._refs.get(rec, 0) - 1
+            if n > 0:
+                self._refs[rec] = n
+            else:
+                self._refs.pop(rec, None)
+                self._pool.pop(rec, None)
+        self._diffs = {k: v for k, v in self._diffs.items() if path not in k}
+        return log
+
+    def label(self, path):
+        # Base name, or the full path when two seeds share a file name.
+        name = os.path.basename(path)
+        if sum(os.path.basename(p) == name for p in self.logs) > 1:
+            return path
+        return name
+
+    def diff(self, path_a, path_b):
+        key = (path_a, path_b)
+        if key not in self._diffs:
+            self._diffs[key] = diff_logs(self.logs[path_a].data, self.logs[path_b].data)
+        return self._diffs[key]
+
+
+def diff_logs(a, b):
+    # Species whose type or base stats differ between two stats tables, plus
+    # the ones only present in one of them. Shared records compare by
+    # identity, so unchanged species cost nothing.
+    result = {"types": [], "stats": [], "only_a": [], "only_b": [k for k in b if k not in a]}
+    for k, ra in a.items():
+        rb = b.get(k)
+        if rb is None:
+            result["only_a"].append(k)
+            continue
+        if ra is rb:
+            continue
+        name = str(rb.get("NAME", k)).strip()
+        ta, tb = str(ra.get("TYPE", "")).strip(), str(rb.get("TYPE", "")).strip()
+        if ta != tb:
+            result["types"].append((k, name, ta, tb))
+        sa, sb = ra.stats, rb.stats
+        if sa != sb:
+            changed = [(s, x, y) for s, x, y in zip(STAT_KEYS, sa, sb) if x != y]
+            result["stats"].append((k, name, changed, ra.bst, rb.bst))
+    return result
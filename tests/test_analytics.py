@@ -0,0 +1,17 @@
+import pytest
+
+from logtracker.analytics import StatTable
+from logtracker.records import make_record
+
+
+def test_speed_ranks_under_either_name():
+    headers = ["NAME", "TYPE", "HP", "ATK", "DEF", "SPD", "SATK", "SDEF"]
+    data = {
+        "pikachu": make_record(headers, ["PIKACHU", "ELECTRIC", "35", "55", "40", "90", "50", "50"]),
+        "onix": make_record(headers, ["ONIX", "ROCK", "35", "45", "160", "70", "30", "45"]),
+    }
+    table = StatTable(data)
+    assert table.column("spd") == table.column("SPE")
+    assert [key for key, _, _ in table.top("SPD", 2)] == ["pikachu", "onix"]
+    with pytest.raises(ValueError):
+        table.column("SPEED")
@@ -0,0 +1,107 @@
+import json
+import os
+
+import pytest
+
+from logtracker import history
+from logtracker.history import JournalHistoryStore, open_history_store, write_snapshot
+
+
+def _store(tmp_path):
+    return JournalHistoryStore(str(tmp_path / "pokemon_history.json"), durable=False)
+
+
+def _journal_line(op):
+    return (json.dumps(op) + "\n").encode("utf-8")
+
+
+def test_torn_last_journal_line_is_dropped_and_truncated(tmp_path):
+    store = _store(tmp_path)
+    good = (_journal_line({"op": "set", "role": "player", "key": "pikachu", "data": {"NAME": "PIKACHU"}})
+            + _journal_line({"op": "set", "role": "enemy", "key": "onix", "data": {"NAME": "ONIX"}}))
+    with open(store.journal_path, "wb") as f:
+        f.write(good + b'{"op": "set", "role": "player", "key": "ee')
+
+    player, enemy = store.load()
+
+    assert player == {"pikachu": {"NAME": "PIKACHU"}}
+    assert enemy == {"onix": {"NAME": "ONIX"}}
+    assert os.path.getsize(store.journal_path) == len(good)
+
+    # New changes land behind the last good line and survive a reload.
+    store.set("player", "eevee", {"NAME": "EEVEE"})
+    store.close()
+    player, _ = _store(tmp_path).load()
+    assert set(player) == {"pikachu", "eevee"}
+
+
+def test_leftover_old_journal_replays_over_newer_snapshot(tmp_path):
+    store = _store(tmp_path)
+    # The snapshot already contains everything the rotated journal did.
+    write_snapshot(store.snapshot_path, {"pikachu": {"NAME": "PIKACHU", "HP": "50"}}, {})
+    with open(store.journal_path + ".old", "wb") as f:
+        f.write(_journal_line({"op": "set", "role": "player", "key": "pikachu", "data": {"NAME": "PIKACHU", "HP": "35"}}))
+        f.write(_journal_line({"op": "set", "role": "player", "key": "onix", "data": {"NAME": "ONIX"}}))
+        f.write(_journal_line({"op": "del", "role": "player", "key": "onix"}))
+        f.write(_journal_line({"op": "clear", "role": "enemy"}))
+        f.write(_journal_line({"op": "set", "role": "player", "key": "pikachu", "data": {"NAME": "PIKACHU", "HP": "50"}}))
+
+    first = store.load()
+    again = _store(tmp_path).load()
+
+    assert first == ({"pikachu": {"NAME": "PIKACHU", "HP": "50"}}, {})
+    assert again == first
+
+
+def test_compaction_interrupted_before_journal_removal(tmp_path, monkeypatch):
+    store = _store(tmp_path)
+    store.set("player", "pikachu", {"NAME": "PIKACHU"})
+    store.set("enemy", "onix", {"NAME": "ONIX"})
+
+    class Crash(Exception):
+        pass
+
+    def crash(path):
+        raise Crash(path)
+
+    # The snapshot is written, then the process dies before the rotated
+    # journal is removed.
+    monkeypatch.setattr(history.os, "remove", crash)
+    with pytest.raises(Crash):
+        store.compact({"pikachu": {"NAME": "PIKACHU"}}, {"onix": {"NAME": "ONIX"}})
+    monkeypatch.undo()
+    assert os.path.exists(store.journal_path + ".old")
+
+    restarted = _store(tmp_path)
+    assert restarted.load() == ({"pikachu": {"NAME": "PIKACHU"}}, {"onix": {"NAME": "ONIX"}})
+
+    # The next compaction folds the leftover journal in and cleans up.
+    restarted.set("player", "eevee", {"NAME": "EEVEE"})
+    player, enemy = restarted.load()
+    restarted.compact(player, enemy)
+    restarted.close()
+    assert not os.path.exists(restarted.journal_path + ".old")
+    assert not os.path.exists(restarted.journal_path)
+    assert _store(tmp_path).load() == ({"pikachu": {"NAME": "PIKACHU"}, "eevee": {"NAME": "EEVEE"}},
+                                       {"onix": {"NAME": "ONIX"}})
+
+
+def test_first_sqlite_open_imports_json_history(tmp_path):
+    snapshot = str(tmp_path / "pokemon_history.json")
+    write_snapshot(snapshot, {"pikachu": {"NAME": "PIKACHU"}}, {"onix": {"NAME": "ONIX"}})
+    journal = JournalHistoryStore(snapshot, durable=False)
+    journal.set("player", "eevee", {"NAME": "EEVEE"})
+    journal.close()
+
+    db = open_history_store(snapshot, "sqlite")
+    assert db.load() == ({"pikachu": {"NAME": "PIKACHU"}, "eevee": {"NAME": "EEVEE"}}, {"onix": {"NAME": "ONIX"}})
+    db.set("enemy", "geodude", {"NAME": "GEODUDE"})
+    db.close()
+
+    # Only the first open imports; later JSON changes are not copied again.
+    write_snapshot(snapshot, {}, {})
+    db = open_history_store(snapshot, "sqlite")
+    player, enemy = db.load()
+    db.close()
+    assert set(player) == {"pikachu", "eevee"}
+    assert set(enemy) == {"onix", "geodude"}
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+import logtracker.log as log_module
+from logtracker.log import PokemonLog, file_signature, load_log, reread_log
+
+LOG = """Randomizer Version: 4.6.1
+Random Seed: 12345
+
+--Pokemon Base Stats & Types--
+NUM|NAME      |TYPE             |  HP| ATK| DEF|SATK|SDEF| SPD|ABILITY1        |ABILITY2        |ABILITY3        |ITEM
+  1|BULBASAUR |GRASS/POISON     |  45|  49|  49|  65|  65|  45|OVERGROW        |OVERGROW        |CHLOROPHYLL     |
+  4|CHARMANDER|FIRE             |  39|  52|  43|  60|  50|  65|BLAZE           |BLAZE           |SOLAR POWER     |
+ 25|PIKACHU   |ELECTRIC         |  35|  55|  40|  50|  50|  90|STATIC          |STATIC          |LIGHTNING ROD   |
+
+--Evolutions--
+BULBASAUR -> IVYSAUR
+"""
+
+
+@pytest.fixture
+def log_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_module, "LOG_CACHE_DIR", str(tmp_path / "log_cache"))
+    path = tmp_path / "seed.log"
+    path.write_text(LOG, encoding="utf-8")
+    return str(path)
+
+
+def test_streamed_load_leaves_a_signature_to_watch(log_path):
+    # The app's path: rows go into a fresh PokemonLog as they stream in, and
+    # the finished load hands over sections and signature.
+    active = PokemonLog(log_path)
+    finished = load_log(log_path, use_cache=False, on_rows=lambda rows, done, total: active.extend(rows))
+    active.set_sections(finished.sections, finished.signature)
+
+    assert active.signature is not None
+    assert active.signature[:2] == file_signature(log_path)
+    assert set(active.data) == {"bulbasaur", "charmander", "pikachu"}
+    assert reread_log(active)[1] is None
+
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write("CHARMANDER -> CHARMELEON\n")
+    os.utime(log_path, ns=(active.signature[1] + 10**9,) * 2)
+    assert file_signature(log_path) != active.signature[:2]
+    signature, parsed = reread_log(active)
+    assert parsed is not None and signature[2] != active.signature[2]
+
+
+def _touch(path, seconds=10):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 10**9))
+
+
+def test_log_cache_hit(log_path):
+    first = load_log(log_path)
+    assert not log_module.log_cache_stats["last_hit"]
+    second = load_log(log_path)
+    assert log_module.log_cache_stats["last_hit"]
+    assert second.data == first.data
+    assert second.sections == first.sections
+    assert second.signature == first.signature
+
+
+def test_log_cache_touch_is_revalidated_by_digest(log_path, monkeypatch):
+    first = load_log(log_path)
+    _touch(log_path)
+    digests = []
+    real_digest = log_module.file_digest
+    monkeypatch.setattr(log_module, "file_digest", lambda p: digests.append(p) or real_digest(p))
+
+    touched = load_log(log_path)
+    assert log_module.log_cache_stats["last_hit"]
+    assert len(digests) == 1
+    assert touched.data == first.data
+    assert touched.signature[:2] == file_signature(log_path)
+
+    # The cache entry took the new mtime, so the next load needs no hashing.
+    load_log(log_path)
+    assert log_module.log_cache_stats["last_hit"]
+    assert len(digests) == 1
+
+
+def test_log_cache_content_change_reparses(log_path):
+    first = load_log(log_path)
+    with open(log_path, "r+b") as f:
+        text = f.read()
+        f.seek(0)
+        f.write(text.replace(b"|  35|  55|", b"|  50|  55|"))   # same size
+    _touch(log_path)
+
+    changed = load_log(log_path)
+    assert not log_module.log_cache_stats["last_hit"]
+    assert changed.signature[2] != first.signature[2]
+    assert changed.data["pikachu"]["HP"] == "50"
+    assert changed.data["bulbasaur"] == first.data["bulbasaur"]
+    assert load_log(log_path).data["pikachu"]["HP"] == "50"
+    assert log_module.log_cache_stats["last_hit"]
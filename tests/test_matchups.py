@@ -0,0 +1,47 @@
+from logtracker.matchups import DUAL_CHART, MATCHUP, TYPE_INDEX, MatchupModel, combo_index
+
+
+def _mon(name, type_, hp):
+    return {"NAME": name, "TYPE": type_, "HP": str(hp), "ATK": "50", "DEF": "50", "SPD": "50", "SATK": "50", "SDEF": "50"}
+
+
+def test_type_chart():
+    assert MATCHUP[combo_index("WATER"), combo_index("FIRE")] == 2
+    assert MATCHUP[combo_index("FIRE"), combo_index("WATER")] == -2
+    assert MATCHUP[combo_index("NORMAL"), combo_index("GHOST")] == 0
+    assert MATCHUP[combo_index("NORMAL"), combo_index("NORMAL")] == 0
+    # One half of a dual type cancels the other's weakness.
+    assert DUAL_CHART[TYPE_INDEX["ELECTRIC"], combo_index("WATER/GROUND")] == 0
+    assert DUAL_CHART[TYPE_INDEX["GROUND"], combo_index("FLYING/STEEL")] == 0
+    assert DUAL_CHART[TYPE_INDEX["ELECTRIC"], combo_index("WATER/FLYING")] == 4
+    assert combo_index("FIRE/FLYING") == combo_index("flying / fire")
+    assert combo_index("???") == combo_index("")
+
+
+def test_answers_rank_by_type_then_bst():
+    model = MatchupModel()
+    model.set("player", "charmander", _mon("CHARMANDER", "FIRE", 39))
+    model.set("player", "onix", _mon("ONIX", "ROCK/GROUND", 35 + 100))
+    model.set("player", "geodude", _mon("GEODUDE", "ROCK/GROUND", 40))
+    model.set("player", "pikachu", _mon("PIKACHU", "ELECTRIC", 35))
+    answers = model.answers(_mon("GYARADOS", "WATER/FLYING", 95))
+    # Pikachu hits 4x and takes neutral hits. Onix and Geodude hit 2x but take
+    # 4x, and Onix has the higher BST. Charmander is resisted and hit 2x.
+    assert [(key, score) for key, _, score in answers] == [("pikachu", 2.0), ("onix", -1.0), ("geodude", -1.0)]
+    assert model.answers(_mon("GYARADOS", "WATER/FLYING", 95), n=4)[3][0] == "charmander"
+
+
+def test_coverage_counts_and_threats():
+    model = MatchupModel()
+    model.set("player", "pikachu", _mon("PIKACHU", "ELECTRIC", 35))
+    model.set("player", "charmander", _mon("CHARMANDER", "FIRE", 39))
+    model.set("enemy", "gyarados", _mon("GYARADOS", "WATER/FLYING", 95))
+    model.set("enemy", "gyarados2", _mon("GYARADOS", "WATER/FLYING", 95))
+    model.set("enemy", "geodude", _mon("GEODUDE", "ROCK/GROUND", 40))
+    summary = model.coverage()
+    assert (summary["ahead"], summary["even"], summary["behind"]) == (2, 0, 1)
+    assert summary["threats"][0] == ("GROUND/ROCK", 1, -2.0)
+    assert summary["best"] == [("ELECTRIC", 1, 2)]
+
+    model.discard("enemy", "geodude")
+    assert model.coverage()["behind"] == 0
@@ -0,0 +1,96 @@
+from logtracker.log import PokemonLog
+from logtracker.names import NameIndex, normalize_name
+
+
+def _rec(name, type_="NORMAL"):
+    return {"NAME": name, "TYPE": type_}
+
+
+def _brute_force(sources, name):
+    # Every answer a full scan of player, enemy and log would accept: the first
+    # source that has the name as a key or a display name, and in it the key
+    # itself or any entry showing that name.
+    dn = normalize_name(name)
+    for role in ("player", "enemy", "log"):
+        data = sources[role]
+        if dn in data:
+            return {(role, dn)}
+        hits = {(role, k) for k, v in data.items() if normalize_name(v.get("NAME", "")) == dn}
+        if hits:
+            return hits
+    return {(None, None)}
+
+
+def _check(index, sources, extra=()):
+    names = set(extra)
+    for data in sources.values():
+        for k, v in data.items():
+            names.update((k, v["NAME"], " %s " % v["NAME"].upper()))
+    for name in sorted(names):
+        assert index.lookup(name) in _brute_force(sources, name), name
+
+
+def test_lookup_matches_brute_force_through_app_changes():
+    log = PokemonLog("seed.log", {
+        "bulbasaur": _rec("Bulbasaur", "GRASS"),
+        "pikachu": _rec("Pikachu", "ELECTRIC"),
+        "mimic": _rec("Pikachu", "FAIRY"),
+        "onix": _rec("Onix", "ROCK"),
+        "eevee": _rec("Eevee"),
+    })
+    sources = {"player": {}, "enemy": {}, "log": log.data}
+    index = NameIndex()
+    index.rebuild("log", log.data)
+    missing = ("missingno", "", "pika")
+    _check(index, sources, missing)
+
+    # classify
+    for role, key in (("player", "pikachu"), ("enemy", "onix"), ("enemy", "mimic"), ("player", "eevee")):
+        entry = dict(log.data[key])
+        sources[role][key] = entry
+        index.add(role, key, entry)
+        _check(index, sources, missing)
+
+    # clear the history
+    for role in ("player", "enemy"):
+        sources[role].clear()
+        index.rebuild(role, sources[role])
+    _check(index, sources, missing)
+
+    # reload: a different seed with history carried over from before
+    sources["player"]["eevee"] = _rec("Eevee", "FIRE")
+    index.rebuild("player", sources["player"])
+    log = PokemonLog("seed2.log", {
+        "eevee": _rec("Eevee", "WATER"),
+        "pikachu": _rec("Pikachu", "STEEL"),
+        "ditto": _rec("Ditto"),
+    })
+    sources["log"] = log.data
+    index.rebuild("log", log.data)
+    _check(index, sources, missing + ("onix", "mimic"))
+
+    # apply a log update: one removed, one renamed, one retyped, two added
+    # (one taking over a name that is still in use)
+    changes = log.apply_update({
+        "eevee": _rec("Eevee", "ICE"),
+        "pikachu": _rec("Raichu", "STEEL"),
+        "raichu": _rec("Raichu", "ELECTRIC"),
+        "zubat": _rec("Zubat", "POISON"),
+    }, {}, None)
+    assert set(changes["removed"]) == {"ditto"}
+    assert set(changes["changed"]) == {"eevee", "pikachu"}
+    index.update("log", changes)
+    _check(index, sources, missing + ("ditto",))
+    assert index.lookup("Ditto") == (None, None)
+    assert index.lookup("raichu") == ("log", "raichu")
+
+
+def test_removing_one_entry_keeps_others_with_the_same_name():
+    index = NameIndex()
+    index.add("log", "mimic", _rec("Pikachu"))
+    index.add("log", "pikachu", _rec("Pikachu"))
+    assert index.lookup("PIKACHU") == ("log", "pikachu")
+    index.remove("log", "pikachu", _rec("Pikachu"))
+    assert index.lookup("Pikachu") == ("log", "mimic")
+    index.remove("log", "mimic", _rec("Pikachu"))
+    assert index.lookup("Pikachu") == (None, None)
@@ -0,0 +1,67 @@
+import pytest
+
+from logtracker.parser import parse_log_sections, parse_pokemon_data, read_log_section, stream_log
+
+HEADER = "NUM|NAME      |TYPE             |  HP| ATK| DEF|SATK|SDEF| SPD|ABILITY1        |ABILITY2        |ABILITY3        |ITEM"
+ROWS = [
+    "  1|BULBASAUR |GRASS/POISON     |  45|  49|  49|  65|  65|  45|OVERGROW        |OVERGROW        |CHLOROPHYLL     |",
+    "  4|CHARMANDER|FIRE             |  39|  52|  43|  60|  50|  65|BLAZE           |BLAZE           |SOLAR POWER     |",
+    " 25|PIKACHU   |ELECTRIC         |  35|  55|  40|  50|  50|  90|STATIC          |STATIC          |LIGHTNING ROD   |",
+]
+# Same shape as a stats row, but past the end of the table.
+STRAY = " 99|MISSINGNO |NORMAL           |  33| 136|   0|   6|   6|  29|NONE            |NONE            |NONE            |"
+
+
+def _lines(table_ends_at_section):
+    lines = ["Randomizer Version: 4.6.1", "Random Seed: 12345", "", "--Pokemon Base Stats & Types--", HEADER, *ROWS]
+    if not table_ends_at_section:
+        lines.append("")
+    lines += ["--Evolutions--", STRAY, "BULBASAUR -> IVYSAUR", "", "--Wild Pokemon--", "Set #1 - Route 1", "PIKACHU Lv5"]
+    return lines
+
+
+def _write(tmp_path, crlf=False, bom=False, trailing_newline=True, table_ends_at_section=False):
+    newline = "\r\n" if crlf else "\n"
+    text = newline.join(_lines(table_ends_at_section))
+    if trailing_newline:
+        text += newline
+    data = text.encode("utf-8")
+    if bom:
+        data = b"\xef\xbb\xbf" + data
+    path = tmp_path / "seed.log"
+    path.write_bytes(data)
+    return str(path)
+
+
+def _streamed(path, chunk_size):
+    data, sections = {}, {}
+    for rows, _ in stream_log(path, sections, chunk_size=chunk_size):
+        data.update(rows)
+    return data, sections
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"crlf": True},
+    {"bom": True},
+    {"trailing_newline": False},
+    {"crlf": True, "trailing_newline": False},
+    {"table_ends_at_section": True},
+    {"crlf": True, "bom": True, "table_ends_at_section": True},
+], ids=lambda o: "-".join(o) or "plain")
+@pytest.mark.parametrize("chunk_size", [7, 64, 1 << 16])
+def test_mmap_parse_and_stream_agree(tmp_path, options, chunk_size):
+    path = _write(tmp_path, **options)
+    data = parse_pokemon_data(path)
+    sections = parse_log_sections(path)
+
+    assert list(data) == ["bulbasaur", "charmander", "pikachu"]
+    assert data["pikachu"]["SPD"] == "90" and data["pikachu"].bst == 320
+    assert set(sections) == {"Pokemon Base Stats & Types", "Evolutions", "Wild Pokemon"}
+    assert "BULBASAUR -> IVYSAUR" in read_log_section(path, sections["Evolutions"])
+    assert read_log_section(path, sections["Wild Pokemon"]).strip().endswith("PIKACHU Lv5")
+
+    streamed, streamed_sections = _streamed(path, chunk_size)
+    assert streamed == data
+    assert list(streamed) == list(data)
+    assert streamed_sections == sections
@@ -0,0 +1,25 @@
+from logtracker.parser import stats_row_reader
+from logtracker.records import record_from_dict
+
+HEADER = "NUM|NAME      |TYPE             |  HP| ATK| DEF|SATK|SDEF| SPD|ABILITY1        |ABILITY2        |ABILITY3        |ITEM"
+ROW = "  1|BULBASAUR |GRASS/POISON     |  45|  49|  49|  65|  65|  45|OVERGROW        |OVERGROW        |CHLOROPHYLL     |"
+
+
+def test_legacy_history_entry_matches_log_row():
+    key, row = stats_row_reader(HEADER)(ROW)
+    # Older versions saved entries as plain dicts with every base key
+    # set-defaulted, which added a blank SPE after the real SPD.
+    legacy = dict(row.to_dict(), SPE="")
+    entry = record_from_dict(legacy)
+
+    assert key == "bulbasaur"
+    assert row.bst == 318
+    assert entry.stats == row.stats
+    assert entry.bst == 318
+    assert entry == row
+
+
+def test_round_trip_keeps_a_record_equal():
+    _, row = stats_row_reader(HEADER)(ROW)
+    assert record_from_dict(row.to_dict()) == row
+    assert record_from_dict({"NAME": "MISSINGNO", "SPE": "", "SPD": ""}).bst == 0
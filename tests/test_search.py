@@ -0,0 +1,32 @@
+import random
+
+from logtracker.search import TIER_FUZZY, TIER_SUBSTRING, SearchIndex, edit_distance
+
+
+def _osa(a, b):
+    d = [[i + j if not i or not j else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+def test_edit_distance_matches_full_table():
+    rng = random.Random(0)
+    for _ in range(20000):
+        a = "".join(rng.choice("abc") for _ in range(rng.randrange(8)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randrange(8)))
+        limit = rng.randrange(4)
+        full = _osa(a, b)
+        assert edit_distance(a, b, limit) == min(full, limit + 1), (a, b, limit)
+
+
+def test_single_typos_are_found():
+    index = SearchIndex()
+    for name in ("Bulbasaur", "Ivysaur", "Venusaur", "Charmander", "Charizard", "Pikachu", "Raichu"):
+        index.add_record(name.lower(), {"NAME": name.upper(), "TYPE": "NORMAL"})
+    for query, key in (("bulbsaur", "bulbasaur"), ("charzard", "charizard"), ("pikahcu", "pikachu")):
+        assert (key, TIER_FUZZY) in index.query(query), query
+    assert index.query("saur")[:3] == [("bulbasaur", TIER_SUBSTRING), ("ivysaur", TIER_SUBSTRING), ("venusaur", TIER_SUBSTRING)]
@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("PIL")
+
+from benchmarks.sprite_server import SpriteServer, make_sprite
+from logtracker.sprites import SpriteStore
+
+
+def test_prefetch_against_local_server(tmp_path):
+    cache = str(tmp_path / "sprite_cache")
+    with SpriteServer(latency=0.01, fail_every=5) as server:
+        store = SpriteStore(cache, base_url=server.base_url, backoff=0)
+        stats = store.prefetch(range(1, 41))
+        assert stats == {"done": 40, "total": 40, "fetched": 40, "failed": 0}
+        assert store.prefetch(range(1, 41))["total"] == 0
+        assert server.requests > 40   # every fifth request failed and was retried
+
+    reopened = SpriteStore(cache)
+    reopened.load_index()
+    assert reopened.get(25) == make_sprite(25)
+    assert reopened.get(41) is None
+
+
+def test_corrupt_cached_sprite_is_dropped(tmp_path):
+    store = SpriteStore(str(tmp_path / "sprite_cache"))
+    store.put(7, "front", make_sprite(7))
+    with open(store._blob_path(store.index["7:front"]["sha"]), "r+b") as f:
+        f.write(b"junk")
+    assert store.get(7) is None
+    assert "7:front" not in store
+    assert store.stats["corrupt"] == 1
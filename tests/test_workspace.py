@@ -0,0 +1,48 @@
+from logtracker.log import PokemonLog
+from logtracker.parser import stats_row_reader
+from logtracker.workspace import Workspace, diff_logs
+
+HEADER = "NUM|NAME      |TYPE             |  HP| ATK| DEF|SATK|SDEF| SPD|ABILITY1        |ABILITY2        |ABILITY3        |ITEM"
+
+
+def _log(path, lines):
+    # Each seed is parsed separately, as it would be from its own file.
+    read = stats_row_reader(HEADER)
+    return PokemonLog(path, dict(read(line) for line in lines))
+
+
+BULBASAUR = "  1|BULBASAUR |GRASS/POISON     |  45|  49|  49|  65|  65|  45|OVERGROW        |OVERGROW        |CHLOROPHYLL     |"
+PIKACHU = " 25|PIKACHU   |ELECTRIC         |  35|  55|  40|  50|  50|  90|STATIC          |STATIC          |LIGHTNING ROD   |"
+PIKACHU_B = " 25|PIKACHU   |ELECTRIC/STEEL   |  50|  55|  40|  50|  50|  90|STATIC          |STATIC          |LIGHTNING ROD   |"
+ONIX = " 95|ONIX      |ROCK/GROUND      |  35|  45| 160|  30|  45|  70|ROCK HEAD       |STURDY          |WEAK ARMOR      |"
+EEVEE = "133|EEVEE     |NORMAL           |  55|  55|  50|  45|  65|  55|RUN AWAY        |ADAPTABILITY    |ANTICIPATION    |"
+
+
+def test_diff_reports_added_removed_and_changed():
+    a = _log("a.log", [BULBASAUR, PIKACHU, ONIX])
+    b = _log("b.log", [BULBASAUR, PIKACHU_B, EEVEE])
+    diff = diff_logs(a.data, b.data)
+    assert diff["only_a"] == ["onix"]
+    assert diff["only_b"] == ["eevee"]
+    assert diff["types"] == [("pikachu", "PIKACHU", "ELECTRIC", "ELECTRIC/STEEL")]
+    assert diff["stats"] == [("pikachu", "PIKACHU", [("HP", 35, 50)], 320, 335)]
+
+
+def test_pooling_shares_unchanged_records():
+    a = _log("a.log", [BULBASAUR, PIKACHU, ONIX])
+    b = _log("b.log", [BULBASAUR, PIKACHU_B, EEVEE])
+    assert a.data["bulbasaur"] is not b.data["bulbasaur"]
+
+    ws = Workspace()
+    ws.add(a)
+    ws.add(b)
+    assert b.data["bulbasaur"] is a.data["bulbasaur"]
+    assert b.data["pikachu"] is not a.data["pikachu"]
+    assert ws.diff("a.log", "b.log") == diff_logs(a.data, b.data)
+
+    # Dropping a seed keeps the shared record alive for the other one, and a
+    # seed added later still finds it.
+    ws.remove("a.log")
+    c = _log("c.log", [BULBASAUR])
+    ws.add(c)
+    assert c.data["bulbasaur"] is b.data["bulbasaur"]